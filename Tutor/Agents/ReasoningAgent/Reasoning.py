@@ -1,15 +1,22 @@
 import sys
 import os
+import time
+import asyncio
 from datetime import datetime
 import ast
 import json
-import httpx
 from uuid import uuid4
 from typing import TypedDict, List, Any, Optional
 from langgraph.graph import StateGraph, END
+from langgraph.types import StreamWriter
 from Tutor.MCPClients.VectorDB import VectorDBClient
 from Tutor.MCPClients.WebSearch import WebSearchClient
 from Tutor.Services.ReasoningModel import ReasoningModel
+from Tutor.Services.EmbeddingModel import EmbeddingModel
+from Tutor.Services.SemanticCache import SemanticAnswerCache
+from Tutor.Services.LLMCache import LLMCache
+from Tutor.Services.HttpClients import HttpClients
+from Tutor.Config.Params import get_param
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 
@@ -65,6 +72,91 @@ def save_response_artifacts(response):
         logger.info(f"[A2A Client Scraping] Total questions extracted: {len(extracted)}")
     else:
         logger.warning("[A2A Client Scraping] No questions extracted from artifacts.")
+    return extracted
+
+def tool_result_documents(result):
+    '''
+    Unpacks an MCP CallToolResult into document texts; FastMCP sends each returned Document as one text item.
+    '''
+    if result is None or getattr(result, "isError", False):
+        return []
+    documents = []
+    for item in getattr(result, "content", None) or []:
+        text = getattr(item, "text", None)
+        if not text:
+            continue
+        try:
+            data = json.loads(text)
+            text = data.get("page_content", text) if isinstance(data, dict) else text
+        except json.JSONDecodeError:
+            pass
+        documents.append(text)
+    return documents
+
+# Background jobs (vector store enrichment) are kept referenced here until they finish.
+_background_tasks = set()
+_enrichment_slots = None
+
+def _spawn_background(coroutine):
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def cancel_background_tasks():
+    for task in list(_background_tasks):
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+async def enrich_from_scraping(search_result, vector_client):
+    '''
+    Sends web search results to the Scraping Agent and upserts the extracted questions into the vector store.
+    Runs off the critical path; failures are logged and never reach the user's request.
+    '''
+    global _enrichment_slots
+    if _enrichment_slots is None:
+        _enrichment_slots = asyncio.Semaphore(get_param("enrichment.max_background_jobs", 2))
+    SCRAPING_AGENT_URL = os.getenv("SCRAPING_AGENT_URL", "http://localhost:10000")
+    SCRAPING_SKILL_ID = "extract_questions"
+
+    payload = {
+        "params": {
+            "skill": SCRAPING_SKILL_ID,
+            "message": {
+                "role": "user",
+                "parts": [
+                    {
+                        "type": "text",
+                        "text": str(search_result),
+                    }
+                ],
+                "messageId": uuid4().hex,
+            }
+        }
+    }
+
+    async with _enrichment_slots:
+        try:
+            start = time.perf_counter()
+            # Pooled keep-alive client shared by every call to the Scraping Agent.
+            client = HttpClients.get("scraping_agent")
+            logger.info(f"[Reasoning Agent] Background enrichment: requesting scraping agent at {SCRAPING_AGENT_URL}.")
+            response = await client.post(
+                SCRAPING_AGENT_URL,
+                json={"skill": SCRAPING_SKILL_ID, **payload},
+            )
+            questions = save_response_artifacts(response.json())
+            if not questions:
+                return
+            upserted = await vector_client.add_documents(questions, source="scraped")
+            logger.info(
+                f"[Reasoning Agent] Background enrichment finished in {time.perf_counter() - start:.1f}s: "
+                f"{tool_result_documents(upserted)}"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[Reasoning Agent] Background enrichment failed: {e}")
 
 # Define state with proper typing
 class AgentState(TypedDict):
@@ -75,6 +167,30 @@ class AgentState(TypedDict):
     documents: Optional[List[Any]]
     has_documents: Optional[bool]
     result: Optional[Any]
+    answer_cache: Optional[Any]
+    cache_hit: Optional[bool]
+    started_at: Optional[float]
+
+# Async node: Semantic answer cache lookup
+async def lookup_answer_cache(state: AgentState) -> AgentState:
+    state["cache_hit"] = False
+    cache = state.get("answer_cache")
+    if not cache:
+        return state
+    try:
+        cached = await asyncio.to_thread(cache.lookup, state.get("question"))
+    except Exception as e:
+        logger.warning(f"[Reasoning Agent] Answer cache lookup failed, continuing without it: {e}")
+        return state
+    if cached is not None:
+        logger.info("[Reasoning Agent] Answer cache hit, skipping retrieval and reasoning.")
+        state["result"] = cached
+        state["cache_hit"] = True
+    return state
+
+# Router node for the answer cache
+def cache_router(state: AgentState) -> str:
+    return "hit" if state.get("cache_hit") else "miss"
 
 # Async node: Retrieve from VectorDB
 async def retrieve_from_vector_db(state: AgentState) -> AgentState:
@@ -93,7 +209,8 @@ async def retrieve_from_vector_db(state: AgentState) -> AgentState:
             state["has_documents"] = False
             return state
             
-        docs = await vector_client.retrieve_documents(query=question)
+        result = await vector_client.retrieve_documents(query=question)
+        docs = tool_result_documents(result)
         logger.info(f"[Reasoning Agent] Retrieved {len(docs)} docs from Vector DB.")
         state["documents"] = docs
         state["has_documents"] = len(docs) > 0
@@ -130,45 +247,10 @@ async def retrieve_from_web(state: AgentState) -> AgentState:
         search_results = await web_client.search(query=question)
         result = json.loads(search_results.content[0].text)
         logger.info(f"[Reasoning Agent] Retrieved fallback results from Web Search.")
-        SCRAPING_AGENT_URL = "http://localhost:10000"
-        SCRAPING_SKILL_ID = "extract_questions"
-        logger.info("[Reasoning Agent] Connecting to scraping agent.")
-        logger.info(f"[Reasoning Agent] Scraping agent URL: {SCRAPING_AGENT_URL} and skill ID: {SCRAPING_SKILL_ID}")
-
-        payload = {
-            "params": {
-                "skill": SCRAPING_SKILL_ID,
-                "message": {
-                    "role": "user",
-                    "parts": [
-                        {
-                            "type": "text",
-                            "text": str(result),
-                        }
-                    ],
-                    "messageId": uuid4().hex,
-                }
-            }
-        }
-
 
-        try:
-            timeout = httpx.Timeout(
-                connect=30.0,
-                read=300.0,
-                write=30.0,
-                pool=30.0
-            )
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                logger.info("[Reasoning Agent] Requesting scraping agent.")
-                response = await client.post(
-                    SCRAPING_AGENT_URL,
-                    json={"skill": SCRAPING_SKILL_ID, **payload},
-                )
-                result_data = response.json()
-                save_response_artifacts(result_data)
-        except Exception as te:
-                logger.warning(f"[ReasoningAgentExecutor] Scraping Agent call failed: {te}")
+        # Scraping runs in the background and feeds the vector store; this answer uses the search snippets.
+        if get_param("enrichment.enabled", True) and state.get("vector_client"):
+            _spawn_background(enrich_from_scraping(result, state["vector_client"]))
 
         state["documents"] = result
         state["has_documents"] = True
@@ -178,7 +260,7 @@ async def retrieve_from_web(state: AgentState) -> AgentState:
         raise TutorException(e, sys)
 
 # Async node: Reasoning
-async def reasoning_node(state: AgentState) -> AgentState:
+async def reasoning_node(state: AgentState, writer: StreamWriter) -> AgentState:
     try:
         model = state.get("reasoning_model")
         question = state.get("question")
@@ -192,8 +274,15 @@ async def reasoning_node(state: AgentState) -> AgentState:
             logger.error("[Reasoning Agent] No question provided to reasoning")
             raise TutorException("No question provided to reasoning", sys)
         
-        # Pass both question and retrieved documents to reasoning model
-        result = await model.reason(question=question, documents=documents)
+        # Pass both question and retrieved documents to reasoning model.
+        # Tokens go to the "custom" stream as they arrive; non-streaming callers only see the final message.
+        result = None
+        async for chunk in model.astream(question=question, documents=documents):
+            result = chunk if result is None else result + chunk
+            if chunk.content:
+                writer({"token": chunk.content})
+        if result is None:
+            raise TutorException("Reasoning model returned an empty response", sys)
         logger.info("[Reasoning Agent] Completed reasoning.")
         state["result"] = result
         return state
@@ -201,14 +290,42 @@ async def reasoning_node(state: AgentState) -> AgentState:
         logger.error(f"[Reasoning Agent] Error in reasoning: {e}")
         raise TutorException(e, sys)
 
+# Async node: Store the fresh answer in the semantic cache
+async def store_answer_cache(state: AgentState) -> AgentState:
+    cache = state.get("answer_cache")
+    if not cache or state.get("result") is None:
+        return state
+    try:
+        latency = time.perf_counter() - (state.get("started_at") or time.perf_counter())
+        await asyncio.to_thread(cache.store, state.get("question"), state["result"], latency)
+    except Exception as e:
+        logger.warning(f"[Reasoning Agent] Could not store answer in cache: {e}")
+    return state
+
 class ReasoningAgent:
     def __init__(self, model_name="llama3-8b-8192"):
         self.model_name = model_name
         self.vector_client = None
         self.web_client = None
         self.reasoning_model = None
+        self.answer_cache = None
         self.app = None
 
+    def _build_answer_cache(self):
+        if not get_param("reasoning.answer_cache.enabled", True):
+            return None
+        try:
+            embedding_model = EmbeddingModel(model_name=get_param("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"))
+            return SemanticAnswerCache(
+                embedding_model=embedding_model,
+                similarity_threshold=get_param("reasoning.answer_cache.similarity_threshold", 0.97),
+                ttl_seconds=get_param("reasoning.answer_cache.ttl_seconds", 3600),
+                max_size=get_param("reasoning.answer_cache.max_size", 1024),
+            )
+        except Exception as e:
+            logger.warning(f"[Reasoning Agent] Answer cache disabled, could not initialize it: {e}")
+            return None
+
     async def initialize(self):
         """Initialize and connect all components"""
         try:
@@ -221,20 +338,28 @@ class ReasoningAgent:
 
             # Initialize reasoning model (without passing vector_client to avoid duplication)
             self.reasoning_model = ReasoningModel(model_name=self.model_name)
+            self.answer_cache = self._build_answer_cache()
 
             # Build LangGraph workflow
             workflow = StateGraph(AgentState)
+            workflow.add_node("cache_lookup", lookup_answer_cache)
             workflow.add_node("vector_db", retrieve_from_vector_db)
             workflow.add_node("web_search", retrieve_from_web)
             workflow.add_node("reason", reasoning_node)
+            workflow.add_node("cache_store", store_answer_cache)
 
-            workflow.set_entry_point("vector_db")
+            workflow.set_entry_point("cache_lookup")
+            workflow.add_conditional_edges("cache_lookup", cache_router, {
+                "hit": END,
+                "miss": "vector_db"
+            })
             workflow.add_conditional_edges("vector_db", router, {
                 "reason": "reason",
                 "web_search": "web_search"
             })
             workflow.add_edge("web_search", "reason")
-            workflow.add_edge("reason", END)
+            workflow.add_edge("reason", "cache_store")
+            workflow.add_edge("cache_store", END)
 
             self.app = workflow.compile()
             logger.info("[Reasoning Agent] Successfully initialized.")
@@ -243,6 +368,21 @@ class ReasoningAgent:
             await self.cleanup()
             raise TutorException(e, sys)
 
+    def _initial_state(self, question: str):
+        # Create initial state with proper structure
+        return AgentState(
+            question=question.strip(),
+            vector_client=self.vector_client,
+            web_client=self.web_client,
+            reasoning_model=self.reasoning_model,
+            documents=None,
+            has_documents=None,
+            result=None,
+            answer_cache=self.answer_cache,
+            cache_hit=None,
+            started_at=time.perf_counter()
+        )
+
     async def run(self, question: str):
         """Run the reasoning agent on a question"""
         if not self.app:
@@ -252,16 +392,7 @@ class ReasoningAgent:
             raise TutorException("Question cannot be empty", sys)
         
         try:
-            # Create initial state with proper structure
-            initial_state = AgentState(
-                question=question.strip(),
-                vector_client=self.vector_client,
-                web_client=self.web_client,
-                reasoning_model=self.reasoning_model,
-                documents=None,
-                has_documents=None,
-                result=None
-            )
+            initial_state = self._initial_state(question)
             
             logger.info(f"[Reasoning Agent] Starting with question: {question[:100]}...")
             result = await self.app.ainvoke(initial_state)
@@ -271,9 +402,38 @@ class ReasoningAgent:
             logger.error(f"[Reasoning Agent] Error running agent: {e}")
             raise TutorException(e, sys)
 
+    async def stream(self, question: str):
+        """Run the agent, yielding {"token": str} while the model reasons and then {"result": message}"""
+        if not self.app:
+            raise TutorException("Agent not initialized. Call initialize() first.", sys)
+
+        if not question or not question.strip():
+            raise TutorException("Question cannot be empty", sys)
+
+        try:
+            final_state = {}
+            async for mode, chunk in self.app.astream(self._initial_state(question), stream_mode=["custom", "values"]):
+                if mode == "custom":
+                    yield chunk
+                else:
+                    final_state = chunk
+            yield {"result": final_state.get("result")}
+        except Exception as e:
+            logger.error(f"[Reasoning Agent] Error streaming agent: {e}")
+            raise TutorException(e, sys)
+
+    def metrics(self) -> dict:
+        """Answer cache hit-rate and latency saved, and LLM response cache hits"""
+        llm_cache = LLMCache.shared()
+        return {
+            "answer_cache": self.answer_cache.metrics() if self.answer_cache else None,
+            "llm_cache": llm_cache.stats() if llm_cache else None,
+        }
+
     async def cleanup(self):
         """Clean up resources"""
         try:
+            await cancel_background_tasks()
             if self.vector_client:
                 await self.vector_client.close()
             if self.web_client:
@@ -302,8 +462,10 @@ async def build_reasoning_agent(model_name="llama3-8b-8192"):
         async def run_agent(question: str):
             return await agent.run(question)
         
-        # Attach cleanup method to the runner for manual cleanup
+        # Attach cleanup, metrics and streaming methods to the runner
         run_agent.cleanup = agent.cleanup
+        run_agent.metrics = agent.metrics
+        run_agent.stream = agent.stream
         
         return run_agent
 
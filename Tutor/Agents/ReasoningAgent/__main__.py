@@ -9,11 +9,20 @@ from a2a.server.tasks import InMemoryTaskStore
 
 from Tutor.Agents.ReasoningAgent.agent_executor import ReasoningAgentExecutor
 from Tutor.Agents.ReasoningAgent.card import agent_card
+from Tutor.MCPClients.SessionPool import MCPSessionPool
+from Tutor.Services.HttpClients import HttpClients
 
 
 def healthcheck(request: Request):
     return JSONResponse({"status": "ok", "message": "Reasoning Agent is live"})
 
+executor = ReasoningAgentExecutor()
+
+def metrics(request: Request):
+    if executor.agent is None:
+        return JSONResponse({"status": "not_initialized"})
+    return JSONResponse(executor.agent.metrics())
+
 def root_check(request: Request):
     html = """
     <!DOCTYPE html>
@@ -35,7 +44,7 @@ def root_check(request: Request):
 if __name__ == "__main__":
     # 1) Create the A2A request handler with your executor
     handler = DefaultRequestHandler(
-        agent_executor=ReasoningAgentExecutor(),
+        agent_executor=executor,
         task_store=InMemoryTaskStore(),
     )
 
@@ -46,9 +55,14 @@ if __name__ == "__main__":
     )
     app = app_builder.build()
 
-    # 3) Add / and /status routes
+    # 3) Add /, /status and /metrics routes
     app.routes.append(Route("/", endpoint=root_check, methods=["GET"]))
     app.routes.append(Route("/status", endpoint=healthcheck, methods=["GET"]))
+    app.routes.append(Route("/metrics", endpoint=metrics, methods=["GET"]))
+    # Open the pooled agent-to-agent HTTP clients; stop them and the pooled MCP servers with the agent.
+    app.add_event_handler("startup", HttpClients.start_all)
+    app.add_event_handler("shutdown", HttpClients.close_all)
+    app.add_event_handler("shutdown", MCPSessionPool.close_all)
 
     # 4) Run the server
     uvicorn.run(app, host="0.0.0.0", port=9002)
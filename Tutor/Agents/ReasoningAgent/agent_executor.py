@@ -1,7 +1,7 @@
 import ast
 import json
-import httpx
 import os
+import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 from datetime import datetime
@@ -9,10 +9,13 @@ from uuid import uuid4
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
-from a2a.types import InternalError, TaskState, TextPart
+from a2a.types import Artifact, InternalError, Task, TaskArtifactUpdateEvent, TaskState, TextPart
 from a2a.utils import new_agent_text_message, new_task
 from a2a.utils.errors import ServerError
 from Tutor.Logging.Logger import logger
+from Tutor.Services.HttpClients import HttpClients
+from Tutor.Services.JsonFieldStream import JsonFieldStream
+from Tutor.Config.Params import get_param
 from Tutor.Agents.ReasoningAgent.Reasoning import build_reasoning_agent
 
 TEACHING_AGENT_URL = os.getenv("TEACHING_AGENT_URL", "http://localhost:9001")   
@@ -60,58 +63,26 @@ class ReasoningAgentExecutor(AgentExecutor):
                 raise ValueError("Missing 'question' in input.")
 
             logger.info("[ReasoningAgentExecutor] Calling reasoning agent.")
-            result = await self.agent(question)
-            parsed = json.loads(result.content.replace('\n', ' ').replace('\r', ' '))
+            thread_id = input_data.get("thread_id")
+            teaching = None
+            if get_param("reasoning.streaming", True):
+                parsed, teaching = await self._stream_reasoning(question, thread_id, event_queue, updater, task)
+            else:
+                result = await self.agent(question)
+                parsed = self._parse_result(result.content)
             answer = parsed.get("correct_answer")
             explanation = parsed.get("reason")
             if not answer or not explanation:
+                if teaching:
+                    teaching.cancel()
                 raise ValueError("Missing answer or explanation in result.")
 
-            # Step 3: Call Teaching Agent
-            payload_query = {
-                "question": question,
-                "answer": answer,
-                "explanation": explanation,
-                "feedback_history": [],
-                "thread_id": input_data.get("thread_id"),
-            }
-
-            teach_payload = teach_payload = {
-                "params": {
-                    "skill": SIMPLIFY_SKILL_ID,
-                    "message": {
-                        "role": "user",
-                        "parts": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(payload_query),
-                            }
-                        ],
-                        "messageId": uuid4().hex,
-                    }
-                }
-            }
-
-            try:
-                async with httpx.AsyncClient() as client:
-                    logger.info("[ReasoningAgentExecutor] Calling Teaching Agent, on URL: %s", TEACHING_AGENT_URL)
-                    logger.info("[ReasoningAgentExecutor] Requesting simplification from Teaching Agent.")
-                    response = await client.post(
-                    TEACHING_AGENT_URL,
-                    json={"skill": SIMPLIFY_SKILL_ID, **teach_payload}
-                )
-                    simplified = simplified = (
-                        response.json()
-                        .get("result", {})
-                        .get("artifacts", [])[0]
-                        .get("parts", [])[0]
-                        .get("text", "")
-                    )
-                    save_response_artifacts(response_text=simplified)
-                    if simplified:
-                        parsed["reason"] = simplified
-            except Exception as te:
-                logger.warning(f"[ReasoningAgentExecutor] Teaching Agent call failed: {te}")
+            # Step 3: Call Teaching Agent (already running if the streamed fields completed early)
+            if teaching is None:
+                teaching = asyncio.create_task(self._simplify(question, answer, explanation, thread_id))
+            simplified = await teaching
+            if simplified:
+                parsed["reason"] = simplified
 
             # Step 4: Add result artifact
             updater.add_artifact(
@@ -136,6 +107,122 @@ class ReasoningAgentExecutor(AgentExecutor):
                 )
             raise ServerError(error=InternalError()) from e
 
+    @staticmethod
+    def _parse_result(content: str) -> dict:
+        try:
+            return json.loads(content.replace('\n', ' ').replace('\r', ' '))
+        except json.JSONDecodeError:
+            # Code fences or trailing commentary around the JSON: pull the fields out directly.
+            fields = JsonFieldStream(["correct_answer", "reason"])
+            fields.feed(content)
+            return dict(fields.values)
+
+    @staticmethod
+    def _send_chunk(event_queue: EventQueue, task: Task, artifact_id: str, text: str, append: bool, last_chunk: bool):
+        event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=task.id,
+                contextId=task.contextId,
+                artifact=Artifact(
+                    artifactId=artifact_id,
+                    name="reasoning_stream",
+                    parts=[TextPart(text=text)],
+                ),
+                append=append,
+                lastChunk=last_chunk,
+            )
+        )
+
+    async def _stream_reasoning(self, question, thread_id, event_queue: EventQueue, updater: TaskUpdater, task: Task):
+        """
+        Forwards reasoning tokens as chunks of a "reasoning_stream" artifact while watching for the
+        correct_answer and reason fields; the Teaching Agent call starts as soon as both are complete.
+        Returns the parsed result and the (possibly running) teaching task.
+        """
+        fields = JsonFieldStream(["correct_answer", "reason"])
+        artifact_id = uuid4().hex
+        chunks_sent = 0
+        pending = None  # held back one step so the final chunk can be flagged lastChunk
+        teaching = None
+        result = None
+        try:
+            async for event in self.agent.stream(question):
+                if "token" not in event:
+                    result = event.get("result")
+                    continue
+                if pending is not None:
+                    self._send_chunk(event_queue, task, artifact_id, pending, append=chunks_sent > 0, last_chunk=False)
+                    chunks_sent += 1
+                pending = event["token"]
+
+                completed = fields.feed(event["token"])
+                if "correct_answer" in completed:
+                    updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(f"Answer found: {completed['correct_answer']}", task.contextId, task.id),
+                    )
+                if completed and fields.done and teaching is None:
+                    logger.info("[ReasoningAgentExecutor] Answer fields complete, starting Teaching Agent hand-off early.")
+                    teaching = asyncio.create_task(self._simplify(
+                        question, fields.values["correct_answer"], fields.values["reason"], thread_id
+                    ))
+            if pending is not None:
+                self._send_chunk(event_queue, task, artifact_id, pending, append=chunks_sent > 0, last_chunk=True)
+        except BaseException:
+            if teaching:
+                teaching.cancel()
+            raise
+
+        if result is None:
+            raise ValueError("Reasoning agent returned no result.")
+        parsed = self._parse_result(result.content)
+        return parsed, teaching
+
+    async def _simplify(self, question, answer, explanation, thread_id):
+        payload_query = {
+            "question": question,
+            "answer": answer,
+            "explanation": explanation,
+            "new_feedback": None,
+            "thread_id": thread_id,
+        }
+
+        teach_payload = {
+            "params": {
+                "skill": SIMPLIFY_SKILL_ID,
+                "message": {
+                    "role": "user",
+                    "parts": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(payload_query),
+                        }
+                    ],
+                    "messageId": uuid4().hex,
+                }
+            }
+        }
+
+        try:
+            # Pooled keep-alive client shared by every call to the Teaching Agent.
+            client = HttpClients.get("teaching_agent")
+            logger.info("[ReasoningAgentExecutor] Calling Teaching Agent, on URL: %s", TEACHING_AGENT_URL)
+            logger.info("[ReasoningAgentExecutor] Requesting simplification from Teaching Agent.")
+            response = await client.post(
+                TEACHING_AGENT_URL,
+                json={"skill": SIMPLIFY_SKILL_ID, **teach_payload}
+            )
+            # The Teaching Agent streams its explanation, so the artifact arrives as many text parts.
+            simplified = "".join(
+                part.get("text", "")
+                for part in response.json().get("result", {}).get("artifacts", [])[0].get("parts", [])
+            ).strip()
+            save_response_artifacts(response_text=simplified)
+            return simplified
+        except Exception as te:
+            logger.warning(f"[ReasoningAgentExecutor] Teaching Agent call failed: {te}")
+            return None
+
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
         task = context.current_task
         if task:
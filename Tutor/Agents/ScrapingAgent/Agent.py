@@ -1,10 +1,15 @@
 import sys
-from typing import TypedDict, Dict, Optional, List, Any
+import time
+import asyncio
+from urllib.parse import urlparse
+from typing import TypedDict, Dict, Optional, List, Any, Callable
 from langgraph.graph import StateGraph, END
 from Tutor.MCPClients.WebScrape import WebScrapeClient
 from Tutor.Services.ScrapeLLM import ScrapeLLM
+from Tutor.Services.ContentCleaner import ContentCleaner
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Config.Params import get_param
 
 # Define state for the scraping agent
 class ScraperState(TypedDict):
@@ -13,7 +18,13 @@ class ScraperState(TypedDict):
     scraper_client: Optional[Any]
     llm: Optional[Any]
     raw_pages: Optional[Dict[str, str]]
+    clean_pages: Optional[Dict[str, str]]
+    cleaner: Optional[Any]
     extracted: Optional[List[Dict[str, Any]]]
+    scrape_config: Optional[Dict[str, Any]]
+    on_extracted: Optional[Callable[[str, Dict[str, Any]], Any]]
+    progress_callback: Optional[Callable[[Dict[str, Any]], Any]]
+    progress: Optional[Any]
 
 #1. Extract URLs from input_data
 async def extract_urls_from_data(state: ScraperState) -> ScraperState:
@@ -45,6 +56,83 @@ async def extract_urls_from_data(state: ScraperState) -> ScraperState:
         logger.error(f"[Scraping Agent] Error extracting URLs from data: {e}")
         raise TutorException(e, sys)
 
+# Bounds total in-flight scrapes and keeps a per-host concurrency cap and spacing between requests.
+class ScrapeLimiter:
+    def __init__(self, max_concurrency: int = 5, per_host_limit: int = 2, per_host_delay: float = 0.5):
+        self._global = asyncio.Semaphore(max_concurrency)
+        self.per_host_limit = per_host_limit
+        self.per_host_delay = per_host_delay
+        self._hosts = {}
+        self._last_request = {}
+
+    async def run(self, url, coroutine_factory):
+        host = urlparse(url).netloc.lower()
+        host_limit = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        # The host slot and its spacing delay come first, so a request waiting on a busy host does not
+        # hold one of the global slots that requests to other hosts could be using.
+        async with host_limit:
+            wait = self._last_request.get(host, 0) + self.per_host_delay - time.monotonic()
+            self._last_request[host] = time.monotonic() + max(wait, 0)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            async with self._global:
+                return await coroutine_factory()
+
+def _make_limiter(config):
+    return ScrapeLimiter(
+        max_concurrency=config.get("max_concurrency", 5),
+        per_host_limit=config.get("per_host_limit", 2),
+        per_host_delay=config.get("per_host_delay", 0.5),
+    )
+
+async def _scrape_page(scraper, limiter, name, url, timeout):
+    try:
+        return await limiter.run(url, lambda: asyncio.wait_for(scraper.scrape(url), timeout=timeout))
+    except asyncio.TimeoutError:
+        logger.warning(f"[Scraping Agent] Timed out after {timeout}s scraping {url} ({name})")
+    except Exception as e:
+        logger.warning(f"[Scraping Agent] Failed to scrape {url} ({name}): {e}")
+    return None
+
+async def _extract_page(model, name, html):
+    # Requests are paced by the model's shared RateLimiter.
+    try:
+        return await model.extract(document=html)
+    except Exception as e:
+        logger.warning(f"[Scraping Agent] Skipping document '{name}' due to error: {e}")
+        return None
+
+async def _notify(callback, *args):
+    # Callbacks report to the caller; a failing one is logged so it cannot stall or abort the scrape.
+    if callback:
+        try:
+            outcome = callback(*args)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        except Exception as e:
+            logger.warning(f"[Scraping Agent] Callback {getattr(callback, '__name__', callback)} failed: {e}")
+
+class _Progress:
+    # Per-run page counters reported through the optional progress callback. Every page ends in exactly one of
+    # scrape_failed, skipped (no usable text after cleaning), extracted or extract_failed, so once the run
+    # finishes those four add up to total; "scraped" counts pages that got past the first stage.
+    def __init__(self, callback, total):
+        self.callback = callback
+        self.counts = {"total": total, "scraped": 0, "scrape_failed": 0, "skipped": 0, "extracted": 0, "extract_failed": 0}
+
+    async def report(self, event, page):
+        self.counts[event] += 1
+        await _notify(self.callback, {"event": event, "page": page, **self.counts})
+
+async def _clean_page(cleaner, name, raw):
+    # bs4 parsing is CPU-bound, so keep it off the event loop.
+    text, stats = await asyncio.to_thread(cleaner.clean, raw, name)
+    return text, stats["tokens_saved"]
+
+async def _record_extracted(state, results, name, extracted):
+    results.append(extracted)
+    await _notify(state.get("on_extracted"), name, extracted)
+
 #2. Scrape the URLs using the WebScrape MCP client
 async def scrape_urls(state: ScraperState) -> ScraperState:
     try:
@@ -56,17 +144,23 @@ async def scrape_urls(state: ScraperState) -> ScraperState:
         if not scraper:
             raise TutorException("No scraper client provided", sys)
 
-        logger.info(f"[Scraping Agent] Scraping {len(urls)} URLs.")
-        results = {}
-        for name, url in urls.items():
-            try:
-                html = await scraper.scrape(url)
-                results[name] = html
-            except Exception as e:
-                logger.warning(f"[Scraping Agent] Failed to scrape {url} ({name}): {e}")
-                continue
+        config = state.get("scrape_config") or {}
+        limiter = _make_limiter(config)
+        timeout = config.get("timeout", 60)
+        progress = _Progress(state.get("progress_callback"), len(urls))
+        state["progress"] = progress  # extract_questions keeps counting on the same totals
+
+        async def scrape_one(name, url):
+            html = await _scrape_page(scraper, limiter, name, url, timeout)
+            await progress.report("scraped" if html is not None else "scrape_failed", name)
+            return name, html
+
+        logger.info(f"[Scraping Agent] Scraping {len(urls)} URLs concurrently.")
+        start = time.perf_counter()
+        scraped = await asyncio.gather(*(scrape_one(name, url) for name, url in urls.items()))
+        results = {name: html for name, html in scraped if html is not None}
         state["raw_pages"] = results
-        logger.info("[Scraping Agent] Scraping completed.")
+        logger.info(f"[Scraping Agent] Scraping completed: {len(results)}/{len(urls)} pages in {time.perf_counter() - start:.1f}s.")
         return state
 
     except Exception as e:
@@ -76,61 +170,199 @@ async def scrape_urls(state: ScraperState) -> ScraperState:
 #3. Extract structured questions using the LLM
 async def extract_questions(state: ScraperState) -> ScraperState:
     try:
-        raw_pages = state.get("raw_pages", {})
+        # An empty clean_pages means cleaning left nothing usable; only fall back to raw pages when it never ran.
+        clean_pages = state.get("clean_pages")
+        raw_pages = clean_pages if clean_pages is not None else (state.get("raw_pages") or {})
         model = state.get("llm")
         if not model:
             raise TutorException("No LLM model provided for extraction", sys)
 
-        logger.info(f"[Scraping Agent] Extracting questions from {len(raw_pages)} pages.")
+        logger.info(f"[Scraping Agent] Extracting questions from {len(raw_pages)} pages concurrently.")
+        progress = state.get("progress") or _Progress(state.get("progress_callback"), len(raw_pages))
+
+        async def extract_one(name, html):
+            return name, await _extract_page(model, name, html)
+
         results = []
-        for name, html in raw_pages.items():
-            try:
-                extracted = await model.extract(document=html)
-                results.append(extracted)
-            except Exception as e:
-                logger.warning(f"[Scraping Agent] Skipping document '{name}' due to error: {e}")
-                continue
         state["extracted"] = results
+        for future in asyncio.as_completed([extract_one(name, html) for name, html in raw_pages.items()]):
+            name, extracted = await future
+            await progress.report("extracted" if extracted is not None else "extract_failed", name)
+            if extracted is not None:
+                await _record_extracted(state, results, name, extracted)
         return state
 
     except Exception as e:
         logger.error(f"[Scraping Agent] Error extracting from HTML: {e}")
         raise TutorException(e, sys)
 
+#2b. Strip markup and boilerplate so only math-bearing text reaches the LLM
+async def preprocess_pages(state: ScraperState) -> ScraperState:
+    try:
+        raw_pages = state.get("raw_pages") or {}
+        cleaner = state.get("cleaner") or ContentCleaner()
+        cleaned = await asyncio.gather(*(_clean_page(cleaner, name, raw) for name, raw in raw_pages.items()))
+
+        progress = state.get("progress") or _Progress(state.get("progress_callback"), len(raw_pages))
+        clean_pages = {}
+        tokens_saved = 0
+        for name, (text, saved) in zip(raw_pages, cleaned):
+            tokens_saved += saved
+            if text:
+                clean_pages[name] = text
+            else:
+                logger.warning(f"[Scraping Agent] No usable text left in '{name}' after cleaning; skipping.")
+                await progress.report("skipped", name)
+        state["clean_pages"] = clean_pages
+        logger.info(f"[Scraping Agent] Preprocessed {len(raw_pages)} pages, ~{tokens_saved} tokens saved.")
+        return state
+
+    except Exception as e:
+        logger.error(f"[Scraping Agent] Error preprocessing pages: {e}")
+        raise TutorException(e, sys)
+
+#3b. Streaming mode: scrape and extract as a pipeline
+async def scrape_and_extract(state: ScraperState) -> ScraperState:
+    '''
+    Hands each page to extraction as soon as its scrape finishes. The bounded queue between the stages
+    applies back-pressure: scrapers wait when extraction falls behind instead of buffering every page.
+    '''
+    try:
+        urls = state.get("url_dict", {})
+        if not urls:
+            raise TutorException("No URLs provided to scraping agent", sys)
+        scraper = state.get("scraper_client")
+        model = state.get("llm")
+        if not scraper or not model:
+            raise TutorException("Scraper client and LLM are both required", sys)
+
+        config = state.get("scrape_config") or {}
+        limiter = _make_limiter(config)
+        timeout = config.get("timeout", 60)
+        workers = max(1, config.get("extract_workers", 4))
+        queue = asyncio.Queue(maxsize=max(1, config.get("queue_size", 4)))
+        progress = _Progress(state.get("progress_callback"), len(urls))
+        state["progress"] = progress
+        cleaner = state.get("cleaner") or ContentCleaner()
+        raw_pages = {}
+        clean_pages = {}
+        results = []
+        tokens_saved = 0
+        state["extracted"] = results
+
+        async def produce(name, url):
+            nonlocal tokens_saved
+            html = await _scrape_page(scraper, limiter, name, url, timeout)
+            await progress.report("scraped" if html is not None else "scrape_failed", name)
+            if html is None:
+                return
+            raw_pages[name] = html
+            text, saved = await _clean_page(cleaner, name, html)
+            tokens_saved += saved
+            if not text:
+                logger.warning(f"[Scraping Agent] No usable text left in '{name}' after cleaning; skipping.")
+                await progress.report("skipped", name)
+                return
+            clean_pages[name] = text
+            await queue.put((name, text))
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    name, html = item
+                    extracted = await _extract_page(model, name, html)
+                    await progress.report("extracted" if extracted is not None else "extract_failed", name)
+                    if extracted is not None:
+                        await _record_extracted(state, results, name, extracted)
+                finally:
+                    queue.task_done()
+
+        logger.info(f"[Scraping Agent] Streaming {len(urls)} URLs through scrape -> extract ({workers} extract workers).")
+        start = time.perf_counter()
+        consumers = [asyncio.create_task(consume()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*(produce(name, url) for name, url in urls.items()))
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+
+        state["raw_pages"] = raw_pages
+        state["clean_pages"] = clean_pages
+        logger.info(
+            f"[Scraping Agent] Pipeline completed: {len(raw_pages)}/{len(urls)} pages scraped, "
+            f"{len(results)} questions extracted in {time.perf_counter() - start:.1f}s, ~{tokens_saved} tokens saved."
+        )
+        return state
+
+    except Exception as e:
+        logger.error(f"[Scraping Agent] Error in scrape/extract pipeline: {e}")
+        raise TutorException(e, sys)
+
 #4. Agent definition using LangGraph
 class ScrapingAgent:
     def __init__(self, model_name="llama3-8b-8192"):
         self.llm = ScrapeLLM(model_name=model_name)
         self.model_name = model_name
+        # Backed by the process-wide MCP session pool, so only the first run pays the server spawn.
+        self.scraper_client = WebScrapeClient()
+        self.cleaner = ContentCleaner(
+            max_tokens=get_param("preprocessing.max_tokens_per_page", 2000),
+            context_lines=get_param("preprocessing.context_lines", 3),
+        )
+        self.mode = get_param("scraping.mode", "pipeline")
 
         workflow = StateGraph(ScraperState)
         workflow.add_node("extract_urls", extract_urls_from_data)
-        workflow.add_node("scrape", scrape_urls)
-        workflow.add_node("extract", extract_questions)
-
         workflow.set_entry_point("extract_urls")
-        workflow.add_edge("extract_urls", "scrape")
-        workflow.add_edge("scrape", "extract")
-        workflow.add_edge("extract", END)
+
+        if self.mode == "pipeline":
+            workflow.add_node("scrape_and_extract", scrape_and_extract)
+            workflow.add_edge("extract_urls", "scrape_and_extract")
+            workflow.add_edge("scrape_and_extract", END)
+        else:
+            workflow.add_node("scrape", scrape_urls)
+            workflow.add_node("preprocess", preprocess_pages)
+            workflow.add_node("extract", extract_questions)
+            workflow.add_edge("extract_urls", "scrape")
+            workflow.add_edge("scrape", "preprocess")
+            workflow.add_edge("preprocess", "extract")
+            workflow.add_edge("extract", END)
 
         self.app = workflow.compile()
-        logger.info("[Scraping Agent] Initialized.")
+        logger.info(f"[Scraping Agent] Initialized in {self.mode} mode.")
 
-    async def run(self, input_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def run(self, input_data: Dict[str, Any], on_extracted: Optional[Callable] = None,
+                  progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        '''
+        `on_extracted(name, question)` is called (and awaited if async) for each question as soon as it is extracted.
+        `progress_callback(event)` receives a dict with the event ("scraped", "scrape_failed", "skipped", "extracted",
+        "extract_failed"), the page name and running counts for every page that finishes a stage.
+        '''
         if not input_data:
             raise TutorException("Input data is empty.", sys)
 
-        scraper_client = WebScrapeClient()
-        await scraper_client.connect()
+        await self.scraper_client.connect()
 
         try:
             state = ScraperState(
                 input_data=input_data,
                 url_dict=None,
-                scraper_client=scraper_client,
+                scraper_client=self.scraper_client,
                 llm=self.llm,
                 raw_pages=None,
+                clean_pages=None,
+                cleaner=self.cleaner,
                 extracted=None,
+                scrape_config=get_param("scraping", {}),
+                on_extracted=on_extracted,
+                progress_callback=progress_callback,
+                progress=None,
             )
             logger.info(f"[Scraping Agent] Running on input with {len(input_data)} entries.")
             result = await self.app.ainvoke(state)
@@ -138,17 +370,15 @@ class ScrapingAgent:
         except Exception as e:
             logger.error(f"[Scraping Agent] Error running agent: {e}")
             raise TutorException(e, sys)
-        finally:
-            logger.info("[Scraping Agent] Closing scraper client.")
-            await scraper_client.close()
 
 #5. Builder for external use 
 async def build_scraping_agent(model_name="llama3-8b-8192"):
     try:
         agent = ScrapingAgent(model_name)
 
-        async def run_scraper(input_data: Dict[str, Any]):
-            return await agent.run(input_data)
+        async def run_scraper(input_data: Dict[str, Any], on_extracted: Optional[Callable] = None,
+                              progress_callback: Optional[Callable] = None):
+            return await agent.run(input_data, on_extracted=on_extracted, progress_callback=progress_callback)
 
         return run_scraper
     except Exception as e:
@@ -11,6 +11,7 @@ from a2a.server.tasks import InMemoryTaskStore, InMemoryPushNotifier
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
 from Tutor.Agents.ScrapingAgent.agent_executor import ScrapingAgentExecutor
+from Tutor.MCPClients.SessionPool import MCPSessionPool
 from Tutor.Logging.Logger import logger
 
 from starlette.responses import JSONResponse, HTMLResponse
@@ -95,6 +96,8 @@ def main():
         app = app_builder.build()
         app.router.routes.append(Route("/", healthcheck, methods=["GET"]))
         app.router.routes.append(Route("/status", status, methods=["GET"]))
+        # Stop the pooled MCP server processes together with the agent.
+        app.add_event_handler("shutdown", MCPSessionPool.close_all)
 
         uvicorn.run(app, host=host, port=port, timeout_keep_alive=300, timeout_graceful_shutdown=300)
 
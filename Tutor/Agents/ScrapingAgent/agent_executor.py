@@ -75,12 +75,10 @@ class ScrapingAgentExecutor(AgentExecutor):
             # Step 3: Do the actual scraping (this is the long operation)
             logger.info("[ScrapingAgentExecutor] Running scraping agent.")
             
-            # Create a task to monitor progress
-            scraping_task = asyncio.create_task(self.agent(input_data))
-            
-            # Wait for completion with periodic progress updates
-            extracted = await self._wait_with_progress_updates(
-                scraping_task, updater, task
+            # Each page that finishes scraping or extraction is reported as it happens.
+            extracted = await self.agent(
+                input_data,
+                progress_callback=self._progress_reporter(updater, task),
             )
 
             # Step 4: Final success message and artifact
@@ -113,63 +111,26 @@ class ScrapingAgentExecutor(AgentExecutor):
                 )
             raise ServerError(error=InternalError()) from e
 
-    async def _wait_with_progress_updates(
-        self, 
-        scraping_task: asyncio.Task, 
-        updater: TaskUpdater, 
-        task: Task
-    ):
-        """Wait for scraping task with periodic progress updates."""
-        
-        progress_messages = [
-            "Analyzing page structure...",
-            "Processing content with AI...",
-            "Extracting question patterns...",
-            "Identifying answer formats...",
-            "Structuring extracted data...",
-        ]
-        
-        message_index = 0
-        update_interval = 15  # seconds
-        
-        while not scraping_task.done():
-            try:
-                # Wait for either completion or timeout
-                result = await asyncio.wait_for(
-                    asyncio.shield(scraping_task), 
-                    timeout=update_interval
-                )
-                return result
-                
-            except asyncio.TimeoutError:
-                # Task is still running, send progress update
-                if message_index < len(progress_messages):
-                    updater.update_status(
-                        TaskState.working,
-                        new_agent_text_message(
-                            progress_messages[message_index],
-                            task.contextId, 
-                            task.id
-                        ),
-                    )
-                    message_index += 1
-                else:
-                    # Cycle through messages or show elapsed time
-                    elapsed_minutes = (message_index - len(progress_messages) + 1) * (update_interval / 60)
-                    updater.update_status(
-                        TaskState.working,
-                        new_agent_text_message(
-                            f"Still processing... ({elapsed_minutes:.1f} minutes elapsed)",
-                            task.contextId, 
-                            task.id
-                        ),
-                    )
-                    message_index += 1
-                
-                continue
-        
-        # Task completed
-        return await scraping_task
+    def _progress_reporter(self, updater: TaskUpdater, task: Task):
+        """Builds the callback that turns per-page pipeline events into A2A status updates."""
+        messages = {
+            "scraped": "Fetched {page} ({scraped}/{total} pages scraped)",
+            "scrape_failed": "Could not fetch {page} ({scraped}/{total} pages scraped)",
+            "extracted": "Extracted a question from {page} ({extracted} of {scraped} scraped pages done)",
+            "skipped": "Skipped {page}: no usable text after cleaning ({skipped} page(s) skipped)",
+            "extract_failed": "No question extracted from {page} ({extract_failed} page(s) failed)",
+        }
+
+        def report(event: dict):
+            template = messages.get(event.get("event"))
+            if not template:
+                return
+            updater.update_status(
+                TaskState.working,
+                new_agent_text_message(template.format(**event), task.contextId, task.id),
+            )
+
+        return report
 
     def _parse_input(self, user_input: str):
         """Parse and validate user input."""
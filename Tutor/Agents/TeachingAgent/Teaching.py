@@ -1,12 +1,25 @@
 import sys
+import time
+import uuid
 import asyncio
+from pathlib import Path
 from typing import TypedDict, Optional, List
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.runnables import RunnableConfig
+from langgraph.types import StreamWriter
 
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 from Tutor.Services.TeachingModel import TeachingModel
+from Tutor.Services.RateLimiter import estimate_tokens
+from Tutor.Config.Params import get_param
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:
+    AsyncSqliteSaver = None
 
 # ——— State Schema ———
 class TeachingState(TypedDict):
@@ -14,6 +27,8 @@ class TeachingState(TypedDict):
     answer: str
     explanation: str
     feedback_history: List[str]
+    new_feedback: Optional[str]
+    history_summary: Optional[str]
     thread_id: Optional[str]
     improved_explanation: Optional[str]
     user_done: Optional[bool]
@@ -21,45 +36,245 @@ class TeachingState(TypedDict):
 # ——— Initialize Model ———
 model = TeachingModel(model_name="llama3-70b-8192")
 
+# ——— Node: Remember Feedback ———
+async def remember_node(state: TeachingState) -> TeachingState:
+    """
+    Appends this turn's feedback to the thread history, then keeps only the newest turns that fit
+    the token budget; older turns are folded into a running summary (or dropped if summarizing fails).
+    """
+    history = list(state.get("feedback_history") or [])
+    if state.get("new_feedback"):
+        history.append(state["new_feedback"])
+    summary = state.get("history_summary") or ""
+
+    budget = get_param("teaching_memory.history_token_budget", 800)
+    kept, used = [], estimate_tokens(summary) if summary else 0
+    for turn in reversed(history):
+        cost = estimate_tokens(turn)
+        if kept and used + cost > budget:
+            break
+        kept.append(turn)
+        used += cost
+    kept.reverse()
+    dropped = history[:len(history) - len(kept)]
+
+    if dropped and get_param("teaching_memory.summarize", True):
+        try:
+            summary = await model.asummarize(summary, dropped)
+            summary = summary[:budget * 2]  # ~half the budget, at ~4 characters per token
+        except Exception as e:
+            logger.warning(f"[TeachingAgent] Could not summarize older feedback, dropping it: {e}")
+    if dropped:
+        logger.info(f"[TeachingAgent] Thread {state.get('thread_id')}: windowed out {len(dropped)} older feedback turn(s).")
+    return {"feedback_history": kept, "history_summary": summary, "new_feedback": None}
+
 # ——— Node: Simplify Explanation ———
-async def simplify_node(state: TeachingState) -> TeachingState:
+async def simplify_node(state: TeachingState, writer: StreamWriter) -> TeachingState:
     try:
         logger.info("[TeachingAgent] simplify_node running...")
-        improved = await model.explain(
+        feedback = list(state.get("feedback_history") or [])
+        if state.get("history_summary"):
+            feedback.insert(0, f"Summary of earlier feedback: {state['history_summary']}")
+        # Tokens go to the "custom" stream as they arrive; non-streaming callers only see the final state.
+        tokens = []
+        async for token in model.astream(
             question=state["question"],
             answer=state["answer"],
             explanation=state["explanation"],
-            feedback_history=state["feedback_history"],
+            feedback_history=feedback,
             thread_id=state["thread_id"]
-        )
-        return {**state, "improved_explanation": improved, "user_done": True}
+        ):
+            tokens.append(token)
+            writer({"token": token})
+        improved = "".join(tokens).strip()
+        # The refined explanation becomes the starting point for the thread's next turn.
+        return {"improved_explanation": improved, "explanation": improved or state["explanation"], "user_done": True}
     except Exception as e:
         raise TutorException(e, sys)
 
 # ——— Build LangGraph ———
 graph = StateGraph(TeachingState)
+graph.add_node("remember", remember_node)
 graph.add_node("simplify", simplify_node)
-graph.set_entry_point("simplify")
+graph.set_entry_point("remember")
+graph.add_edge("remember", "simplify")
 graph.add_edge("simplify", END)
-app_runnable = graph.compile()
+
+# ——— Thread Memory ———
+# Checkpoint ids are uuid6 values whose timestamp counts 100 ns intervals since 1582-10-15.
+UUID_EPOCH_OFFSET = 0x01b21dd213814000
+
+def checkpoint_time(checkpoint_id: str) -> float:
+    value = uuid.UUID(checkpoint_id)
+    timestamp = (value.time_low << 28) | (value.time_mid << 12) | (value.time_hi_version & 0x0FFF)
+    return (timestamp - UUID_EPOCH_OFFSET) / 1e7
+
+class TeachingMemory:
+    """
+    Compiles the graph with a checkpointer keyed by thread_id, so history lives server-side.
+    Uses AsyncSqliteSaver when langgraph-checkpoint-sqlite is installed, otherwise MemorySaver.
+    Threads whose latest checkpoint is older than `idle_ttl_seconds` are deleted; the sweep reads the
+    checkpoint store itself, so threads left behind by earlier runs of the agent are found too.
+    """
+    def __init__(self):
+        self.app = None
+        self.checkpointer = None
+        self._conn = None
+        self._loop = None
+        self._lock = None
+        self._last_sweep = 0.0
+
+    async def get_app(self):
+        loop = asyncio.get_running_loop()
+        if self.app is not None and self._loop is loop:
+            return self.app
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self.app = None
+        async with self._lock:
+            if self.app is None:
+                self.checkpointer = await self._build_checkpointer()
+                self.app = graph.compile(checkpointer=self.checkpointer)
+                self._last_sweep = 0.0
+        return self.app
+
+    async def _build_checkpointer(self):
+        backend = get_param("teaching_memory.backend", "sqlite")
+        if backend == "sqlite" and AsyncSqliteSaver is not None:
+            db_path = get_param("teaching_memory.db_path", "Tutor/Artifacts/TeachingMemory/threads.sqlite")
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = await aiosqlite.connect(db_path)
+            saver = AsyncSqliteSaver(self._conn)
+            await saver.setup()
+            logger.info(f"[TeachingAgent] Thread memory stored in SQLite at {db_path}.")
+            return saver
+        if backend == "sqlite":
+            logger.warning("[TeachingAgent] langgraph-checkpoint-sqlite not installed; thread memory is in-process only.")
+        return MemorySaver()
+
+    async def _latest_checkpoints(self) -> dict:
+        """
+        Returns thread_id -> id of its newest checkpoint (uuid6 ids sort by creation time).
+        """
+        if self._conn is not None:
+            async with self._conn.execute("SELECT thread_id, MAX(checkpoint_id) FROM checkpoints GROUP BY thread_id") as cursor:
+                return {thread_id: checkpoint_id async for thread_id, checkpoint_id in cursor}
+        latest = {}
+        for thread_id, namespaces in self.checkpointer.storage.items():
+            ids = [checkpoint_id for checkpoints in namespaces.values() for checkpoint_id in checkpoints]
+            if ids:
+                latest[thread_id] = max(ids)
+        return latest
+
+    async def sweep(self, keep: str = None):
+        """
+        Deletes idle threads other than `keep` (the thread being served); runs at most once a minute,
+        the first time right after the store is opened.
+        """
+        now = time.time()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        idle_ttl = get_param("teaching_memory.idle_ttl_seconds", 86400)
+        try:
+            latest = await self._latest_checkpoints()
+        except Exception as e:
+            logger.warning(f"[TeachingAgent] Could not scan thread memory for idle threads: {e}")
+            return
+        idle = [
+            thread_id for thread_id, checkpoint_id in latest.items()
+            if thread_id != keep and now - checkpoint_time(checkpoint_id) > idle_ttl
+        ]
+        for thread_id in idle:
+            await self.forget(thread_id)
+        if idle:
+            logger.info(f"[TeachingAgent] Evicted {len(idle)} idle thread(s).")
+
+    async def forget(self, thread_id: str):
+        if self.checkpointer is None:
+            return
+        try:
+            await self.checkpointer.adelete_thread(thread_id)
+        except Exception as e:
+            logger.warning(f"[TeachingAgent] Could not delete thread {thread_id}: {e}")
+
+    async def close(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+        self.app = None
+
+memory = TeachingMemory()
+
+async def close_memory():
+    await memory.close()
 
 # ——— Public API ———
+async def _prepare_turn(input_data: dict):
+    """
+    Builds the graph input and config for one turn. Only the fields the caller sent are written, so a
+    follow-up can carry just `thread_id` and `new_feedback`. A non-empty `feedback_history` list (legacy
+    callers that resend everything) replaces the stored history; an empty one is ignored.
+    """
+    app = await memory.get_app()
+    thread_id = input_data.get("thread_id")
+    ephemeral = not thread_id
+    thread_id = thread_id or f"ephemeral-{uuid.uuid4().hex}"
+    config = RunnableConfig(configurable={"thread_id": thread_id})
+    # Sweep before reading the thread, so a thread that is just past its TTL is not deleted mid-turn.
+    await memory.sweep(keep=thread_id)
+
+    turn = {key: input_data[key] for key in ("question", "answer", "explanation") if input_data.get(key) is not None}
+    if input_data.get("feedback_history"):
+        turn["feedback_history"] = list(input_data.get("feedback_history") or [])
+        turn["history_summary"] = ""
+    turn.update(new_feedback=input_data.get("new_feedback"), thread_id=thread_id, improved_explanation=None, user_done=False)
+
+    missing = [key for key in ("question", "answer", "explanation") if key not in turn]
+    if missing:
+        stored = (await app.aget_state(config)).values
+        if any(key not in stored for key in missing):
+            raise ValueError(f"Thread {thread_id} has no stored {', '.join(missing)}; send them on the first turn.")
+    return app, turn, config, ephemeral
+
 async def run_teaching(input_data: dict) -> dict:
     """
     input_data must contain:
-      question, answer, explanation, feedback_history (list), thread_id (opt)
+      question, answer, explanation (first turn of a thread), thread_id (opt),
+      new_feedback (opt) or feedback_history (list, replaces the stored history)
     """
+    ephemeral_thread = None
     try:
-        initial_state: TeachingState = {
-            "question": input_data["question"],
-            "answer": input_data["answer"],
-            "explanation": input_data["explanation"],
-            "feedback_history": input_data.get("feedback_history", []),
-            "thread_id": input_data.get("thread_id"),
-            "improved_explanation": None,
-            "user_done": False
-        }
-        final_state = await app_runnable.ainvoke(initial_state, config=RunnableConfig())
+        app, turn, config, ephemeral = await _prepare_turn(input_data)
+        ephemeral_thread = turn["thread_id"] if ephemeral else None
+        final_state = await app.ainvoke(turn, config=config)
         return final_state  # contains improved_explanation
     except Exception as e:
         raise TutorException(e, sys)
+    finally:
+        if ephemeral_thread:
+            await memory.forget(ephemeral_thread)
+
+async def stream_teaching(input_data: dict):
+    """
+    Same input as run_teaching. Yields {"token": str} as the explanation is generated,
+    then {"final_state": dict} once the graph finishes.
+    """
+    ephemeral_thread = None
+    try:
+        app, turn, config, ephemeral = await _prepare_turn(input_data)
+        ephemeral_thread = turn["thread_id"] if ephemeral else None
+        final_state = None
+        async for mode, chunk in app.astream(turn, config=config, stream_mode=["custom", "values"]):
+            if mode == "custom":
+                yield chunk
+            else:
+                final_state = chunk
+        yield {"final_state": final_state}
+    except Exception as e:
+        raise TutorException(e, sys)
+    finally:
+        # Also runs when the client disconnects and the generator is closed mid-stream.
+        if ephemeral_thread:
+            await memory.forget(ephemeral_thread)
@@ -3,6 +3,7 @@ from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from Tutor.Agents.TeachingAgent.agent_executor import TeachingAgentExecutor
 from Tutor.Agents.TeachingAgent.card import agent_card
+from Tutor.Agents.TeachingAgent.Teaching import close_memory
 
 from starlette.responses import JSONResponse, HTMLResponse
 from starlette.routing import Route
@@ -53,6 +54,7 @@ if __name__ == "__main__":
     app = app_builder.build()
     app.router.routes.append(Route("/", healthcheck, methods=["GET"]))
     app.router.routes.append(Route("/status", status, methods=["GET"]))
+    app.add_event_handler("shutdown", close_memory)
 
     # Step 4: Run with Uvicorn
     uvicorn.run(app, host="0.0.0.0", port=9001)
\ No newline at end of file
@@ -1,12 +1,15 @@
 import ast
 import asyncio
+import uuid
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    Artifact,
     InternalError,
     InvalidParamsError,
     Task,
+    TaskArtifactUpdateEvent,
     TaskState,
     TextPart,
 )
@@ -16,7 +19,7 @@ from a2a.utils import (
 )
 from a2a.utils.errors import ServerError
 
-from Tutor.Agents.TeachingAgent.Teaching import run_teaching
+from Tutor.Agents.TeachingAgent.Teaching import stream_teaching
 from Tutor.Logging.Logger import logger
 from typing_extensions import override
 
@@ -56,15 +59,25 @@ class TeachingAgentExecutor(AgentExecutor):
 
             await asyncio.sleep(0.1)  # Brief pause for UX
 
-            # Step 4: Run teaching model
+            # Step 4: Run teaching model, streaming tokens as chunks of one artifact
             logger.info("[TeachingAgentExecutor] Running teaching model.")
-            final_state = await run_teaching(user_input)
-            improved_explanation = final_state.get("improved_explanation", "[no explanation generated]")
-            # Step 5: Add explanation as artifact
-            updater.add_artifact(
-                parts=[TextPart(text=improved_explanation)],
-                name="teaching_result",
-            )
+            artifact_id = str(uuid.uuid4())
+            chunks_sent = 0
+            final_state = {}
+            async for event in stream_teaching(user_input):
+                if "token" not in event:
+                    final_state = event.get("final_state") or {}
+                    continue
+                token = event["token"] if chunks_sent else event["token"].lstrip()
+                if not token:
+                    continue
+                self._send_chunk(event_queue, task, artifact_id, token, append=chunks_sent > 0, last_chunk=False)
+                chunks_sent += 1
+
+            # Step 5: Replace the streamed chunks with the whole, stripped explanation. Non-streaming callers
+            # get a single text part, and streaming clients end up with the same text as improved_explanation.
+            explanation = final_state.get("improved_explanation") or "[no explanation generated]"
+            self._send_chunk(event_queue, task, artifact_id, explanation, append=False, last_chunk=True)
 
             # Step 6: Mark task complete
             updater.update_status(
@@ -85,6 +98,22 @@ class TeachingAgentExecutor(AgentExecutor):
                 )
             raise ServerError(error=InternalError()) from e
 
+    @staticmethod
+    def _send_chunk(event_queue: EventQueue, task: Task, artifact_id: str, text: str, append: bool, last_chunk: bool):
+        event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=task.id,
+                contextId=task.contextId,
+                artifact=Artifact(
+                    artifactId=artifact_id,
+                    name="teaching_result",
+                    parts=[TextPart(text=text)],
+                ),
+                append=append,
+                lastChunk=last_chunk,
+            )
+        )
+
     @override
     async def cancel(
         self,
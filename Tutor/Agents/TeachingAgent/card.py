@@ -18,6 +18,6 @@ agent_card = AgentCard(
     version="1.0.0",
     defaultInputModes=["text"],
     defaultOutputModes=["text"],
-    capabilities=AgentCapabilities(streaming=False),
+    capabilities=AgentCapabilities(streaming=True),
     skills=[simplify_skill],
 )
@@ -0,0 +1,34 @@
+'''
+This file is used to read the project configuration from params.yaml.
+'''
+import os
+import sys
+import yaml
+from functools import lru_cache
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+PARAMS_PATH = os.getenv("TUTOR_PARAMS_PATH", "params.yaml")
+
+@lru_cache(maxsize=None)
+def load_params(path: str = PARAMS_PATH) -> dict:
+    try:
+        if not os.path.exists(path):
+            logger.warning(f"Params file not found at {path}, using defaults.")
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Error reading params file: {path}")
+        raise TutorException(e, sys)
+
+def get_param(key: str, default=None):
+    '''
+    Looks up a dotted key such as "vectorstore.backend" in params.yaml.
+    '''
+    value = load_params()
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
@@ -0,0 +1,36 @@
+'''
+This file converts ScrapedQA dicts returned by the Scraping Agent into vector store Documents, so questions
+found on the web can be answered from the vector_db node the next time they are asked.
+'''
+from langchain_core.documents import Document
+from Tutor.Data.Manifest import content_hash
+from Tutor.Data.Metadata import normalize_topic, normalize_difficulty
+
+def questions_to_documents(questions, source: str = "scraped"):
+    '''
+    Returns (documents, ids). Content follows the corpus "Problem/Solution" layout and ids are content hashes,
+    the same scheme PushToDB uses, so re-scraped or already ingested questions upsert instead of duplicating.
+    '''
+    documents, ids, seen = [], [], set()
+    for item in questions or []:
+        if not isinstance(item, dict):
+            continue
+        question, answer = item.get("question"), item.get("answer")
+        if not (question and answer):
+            continue
+        content = f"Problem: {str(question).strip()}\nSolution: {str(answer).strip()}"
+        doc_id = content_hash(content)
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+
+        metadata = {"source": source}
+        topic = normalize_topic(item.get("topic"))
+        difficulty = normalize_difficulty(item.get("difficulty"))
+        if topic:
+            metadata["topic"] = topic
+        if difficulty:
+            metadata["difficulty"] = difficulty
+        documents.append(Document(page_content=content, metadata=metadata))
+        ids.append(doc_id)
+    return documents, ids
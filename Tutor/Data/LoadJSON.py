@@ -1,32 +1,120 @@
 import os
-import json
 import sys
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.documents import Document
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Data.Metadata import normalize_topic, normalize_difficulty, parse_level, difficulty_from_level
 
 class LoadJSON:
     @staticmethod
-    def load_documents(directory_path):
+    def _scan_json_files(directory_path):
+        '''
+        Walks the data folder (recursively) with os.scandir and yields the paths of all JSON files.
+        '''
+        stack = [directory_path]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".json"):
+                        yield entry.path
+                    else:
+                        logger.debug(f"Skipping non-JSON file: {entry.name}")
+
+    @staticmethod
+    def _parse_file(file_path, directory_path, failures=None):
+        try:
+            with open(file_path, "rb") as f:
+                data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Skipping unreadable JSON file {file_path}: {e}")
+            if failures is not None:
+                failures.append(file_path)
+            return None
+
+        problem = data.get("problem")
+        solution = data.get("solution")
+        if not (problem and solution):
+            return None
+
+        content = f"Problem: {problem}\nSolution: {solution}"
+        source = os.path.relpath(file_path, directory_path)
+        metadata = {"source": source}
+        topic = normalize_topic(data.get("type") or data.get("topic"))
+        level = parse_level(data.get("level"))
+        difficulty = normalize_difficulty(data.get("difficulty")) or difficulty_from_level(level)
+        if topic:
+            metadata["topic"] = topic
+        if level is not None:
+            metadata["level"] = level
+        if difficulty:
+            metadata["difficulty"] = difficulty
+        return Document(page_content=content, metadata=metadata)
+
+    @staticmethod
+    def iter_documents(directory_path, batch_size=512, max_workers=8, failures=None):
+        '''
+        Streams the corpus as lists of at most `batch_size` Documents.
+        Files are parsed in a thread pool while the walk continues, so callers can start
+        pushing the first batch before the whole folder has been read.
+        Paths of files that could not be read or parsed are appended to `failures` when it is given.
+        '''
         try:
-            docs = []
-            for filename in os.listdir(directory_path):
-                logger.info(f"Loading file: {filename}")
-                if not filename.endswith(".json"):
-                    logger.warning(f"Skipping non-JSON file: {filename}")
-                    continue
-                if filename.endswith(".json"):
-                    file_path = os.path.join(directory_path, filename)
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        problem = data.get("problem")
-                        solution = data.get("solution")
-                        if problem and solution:
-                            content = f"Problem: {problem}\nSolution: {solution}"
-                            logger.info(f"Loaded content from {filename}: {content}")
-                            docs.append(Document(page_content=content, metadata={"source": filename}))
-            return docs
+            if batch_size <= 0:
+                raise ValueError("batch_size must be a positive integer.")
+
+            start = time.perf_counter()
+            files_seen = 0
+            docs_loaded = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = None
+                paths = []
+                for file_path in LoadJSON._scan_json_files(directory_path):
+                    paths.append(file_path)
+                    if len(paths) < batch_size:
+                        continue
+                    # Submit the next batch before collecting the previous one, so parsing overlaps the walk.
+                    submitted = [executor.submit(LoadJSON._parse_file, p, directory_path, failures) for p in paths]
+                    files_seen += len(paths)
+                    paths = []
+                    if pending:
+                        batch = [doc for doc in (f.result() for f in pending) if doc]
+                        docs_loaded += len(batch)
+                        if batch:
+                            yield batch
+                    pending = submitted
+
+                if paths:
+                    submitted = [executor.submit(LoadJSON._parse_file, p, directory_path, failures) for p in paths]
+                    files_seen += len(paths)
+                else:
+                    submitted = None
+
+                for futures in (pending, submitted):
+                    if not futures:
+                        continue
+                    batch = [doc for doc in (f.result() for f in futures) if doc]
+                    docs_loaded += len(batch)
+                    if batch:
+                        yield batch
+
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            logger.info(
+                f"Loaded {docs_loaded} documents from {files_seen} JSON files in {elapsed:.2f}s "
+                f"({files_seen / elapsed:.1f} files/sec)."
+            )
         except Exception as e:
             logger.error(f"Error loading JSON files: {e}")
-            raise TutorException(e,sys)
\ No newline at end of file
+            raise TutorException(e, sys)
+
+    @staticmethod
+    def load_documents(directory_path, batch_size=512, max_workers=8):
+        docs = []
+        for batch in LoadJSON.iter_documents(directory_path, batch_size=batch_size, max_workers=max_workers):
+            docs.extend(batch)
+        return docs
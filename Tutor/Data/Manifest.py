@@ -0,0 +1,157 @@
+'''
+This file keeps a local record of what has already been pushed to the vector store, so re-ingestion
+only embeds and uploads new or changed files.
+'''
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def fingerprint(document) -> str:
+    # Covers metadata too, so a metadata-only change (e.g. a new topic tag) is re-pushed under the same id.
+    return content_hash(document.page_content + "\x00" + json.dumps(document.metadata, sort_keys=True))
+
+class IngestManifest:
+    # Sources are paths relative to the ingest root, so the same relative path under two roots is two entries.
+    # Entries recorded before roots were tracked have root '' until an ingest claims them.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            root TEXT NOT NULL DEFAULT '',
+            source TEXT NOT NULL,
+            doc_id TEXT NOT NULL,
+            fingerprint TEXT,
+            pushed_at REAL NOT NULL,
+            deleted_at REAL,
+            PRIMARY KEY (root, source)
+        )
+    """
+
+    def __init__(self, db_path: str = "Tutor/Artifacts/Manifest/ingest_manifest.sqlite"):
+        try:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self.db_path = db_path
+            self.conn = sqlite3.connect(db_path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(self.SCHEMA.format(table="documents"))
+            self._migrate()
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_doc_id ON documents(doc_id)")
+            self.conn.commit()
+            logger.info(f"[IngestManifest] Using manifest at {db_path}")
+        except Exception as e:
+            logger.error("[IngestManifest] Error opening ingestion manifest.")
+            raise TutorException(e, sys)
+
+    def _migrate(self):
+        '''
+        Rebuilds manifests keyed on source alone (with or without the fingerprint and root columns) as (root, source).
+        '''
+        info = list(self.conn.execute("PRAGMA table_info(documents)"))
+        key = [name for _, name, _, _, _, pk in sorted(info, key=lambda row: row[5]) if pk]
+        if key == ["root", "source"]:
+            return
+        columns = {row[1] for row in info}
+        fingerprint_column = "fingerprint" if "fingerprint" in columns else "NULL"
+        root_column = "COALESCE(root, '')" if "root" in columns else "''"
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS documents_migrated")
+            self.conn.execute(self.SCHEMA.format(table="documents_migrated"))
+            self.conn.execute(
+                f"""
+                INSERT INTO documents_migrated (root, source, doc_id, fingerprint, pushed_at, deleted_at)
+                SELECT {root_column}, source, doc_id, {fingerprint_column}, pushed_at, deleted_at FROM documents
+                """
+            )
+            self.conn.execute("DROP TABLE documents")
+            self.conn.execute("ALTER TABLE documents_migrated RENAME TO documents")
+        logger.info("[IngestManifest] Migrated manifest to (root, source) keys.")
+
+    def diff(self, documents, root: str):
+        '''
+        Returns (document, doc_id, previous_doc_id) for every document that is new or whose content or metadata changed.
+        '''
+        sources = [doc.metadata["source"] for doc in documents]
+        known = {}
+        for i in range(0, len(sources), 500):
+            chunk = sources[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT source, doc_id, fingerprint FROM documents "
+                f"WHERE root = ? AND deleted_at IS NULL AND source IN ({','.join('?' * len(chunk))})",
+                [root, *chunk],
+            )
+            known.update((source, (doc_id, stored)) for source, doc_id, stored in rows)
+
+        changed = []
+        for doc in documents:
+            doc_id = content_hash(doc.page_content)
+            previous, stored = known.get(doc.metadata["source"], (None, None))
+            if previous != doc_id or stored != fingerprint(doc):
+                changed.append((doc, doc_id, previous))
+        return changed
+
+    def is_referenced(self, doc_id: str, root: str, excluding=()) -> bool:
+        '''
+        Whether a live entry other than `excluding` (sources of `root`) still maps to `doc_id`. Ids are content
+        hashes shared by every root, so entries of all roots are checked.
+        '''
+        rows = self.conn.execute(
+            "SELECT root, source FROM documents WHERE doc_id = ? AND deleted_at IS NULL", (doc_id,)
+        ).fetchall()
+        excluding = set(excluding)
+        return any(entry_root != root or source not in excluding for entry_root, source in rows)
+
+    def record(self, entries, root: str):
+        '''
+        Marks (document, doc_id) pairs as pushed from the ingest root directory `root`.
+        '''
+        now = time.time()
+        self.conn.executemany(
+            """
+            INSERT INTO documents (root, source, doc_id, fingerprint, pushed_at, deleted_at) VALUES (?, ?, ?, ?, ?, NULL)
+            ON CONFLICT(root, source) DO UPDATE SET
+                doc_id = excluded.doc_id, fingerprint = excluded.fingerprint, pushed_at = excluded.pushed_at, deleted_at = NULL
+            """,
+            [(root, doc.metadata["source"], doc_id, fingerprint(doc), now) for doc, doc_id in entries],
+        )
+        self.conn.commit()
+
+    def claim(self, sources, root: str):
+        '''
+        Assigns entries recorded before roots were tracked to the root they were just seen under.
+        An entry this root already has is kept as is.
+        '''
+        self.conn.executemany(
+            "UPDATE OR IGNORE documents SET root = ? WHERE root = '' AND source = ?",
+            [(root, source) for source in sources],
+        )
+        self.conn.commit()
+
+    def missing_sources(self, seen_sources, root: str):
+        '''
+        Returns (source, doc_id) for live entries of this ingest root whose file was not seen in this run
+        and no longer exists on disk. Entries from other roots, or not yet claimed by one, are never returned.
+        '''
+        rows = self.conn.execute(
+            "SELECT source, doc_id FROM documents WHERE deleted_at IS NULL AND root = ?", (root,)
+        ).fetchall()
+        return [
+            (source, doc_id) for source, doc_id in rows
+            if source not in seen_sources and not os.path.exists(os.path.join(root, source))
+        ]
+
+    def tombstone(self, sources, root: str):
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE documents SET deleted_at = ? WHERE root = ? AND source = ?",
+            [(now, root, source) for source in sources],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
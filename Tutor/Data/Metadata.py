@@ -0,0 +1,67 @@
+'''
+This file normalises the topic/difficulty/level metadata attached to documents and used as retrieval filters,
+so the MATH corpus and questions classified by ScrapeLLM share one vocabulary.
+'''
+import re
+
+TOPICS = [
+    "counting and probability",
+    "algebra",
+    "geometry",
+    "intermediate algebra",
+    "precalculus",
+    "prealgebra",
+    "number theory",
+]
+DIFFICULTIES = ["easy", "medium", "hard"]
+FILTER_KEYS = ("topic", "difficulty", "level")
+
+def normalize_topic(topic):
+    if not topic:
+        return None
+    topic = " ".join(str(topic).lower().replace("&", " and ").split())
+    return topic if topic in TOPICS else None
+
+def normalize_difficulty(difficulty):
+    if not difficulty:
+        return None
+    difficulty = str(difficulty).strip().lower()
+    return difficulty if difficulty in DIFFICULTIES else None
+
+def parse_level(level):
+    '''
+    Accepts MATH-style "Level 3" strings or plain integers.
+    '''
+    if level is None:
+        return None
+    if isinstance(level, int):
+        return level
+    match = re.search(r"\d+", str(level))
+    return int(match.group()) if match else None
+
+def difficulty_from_level(level):
+    if level is None:
+        return None
+    if level <= 2:
+        return "easy"
+    if level == 3:
+        return "medium"
+    return "hard"
+
+def build_filters(topic=None, difficulty=None, level=None):
+    '''
+    Builds a metadata filter dict from optional tool arguments, dropping anything unset.
+    Raises ValueError for values outside the known vocabulary so callers do not silently get unfiltered results.
+    '''
+    filters = {}
+    if topic:
+        filters["topic"] = normalize_topic(topic)
+        if filters["topic"] is None:
+            raise ValueError(f"Unknown topic '{topic}'. Expected one of: {', '.join(TOPICS)}")
+    if difficulty:
+        filters["difficulty"] = normalize_difficulty(difficulty)
+        if filters["difficulty"] is None:
+            raise ValueError(f"Unknown difficulty '{difficulty}'. Expected one of: {', '.join(DIFFICULTIES)}")
+    if level is not None:
+        filters["level"] = parse_level(level)
+    return filters
@@ -3,29 +3,78 @@ import os
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 from Tutor.Data.LoadJSON import LoadJSON
+from Tutor.Data.Manifest import IngestManifest
 from Tutor.Services.VectorStore import VectorStore
 
 class PushToDB:
-    def __init__(self, vector_store):
+    def __init__(self, vector_store, manifest=None):
         try:
             if not isinstance(vector_store, VectorStore):
                 raise ValueError("vector_store must be an instance of VectorStore")
             self.vector_store = vector_store
+            self.manifest = manifest or IngestManifest()
         except Exception as e:
             logger.error(f"Error initializing PushToDB: {e}")
             raise TutorException(e, sys)
 
+    def _stale_ids(self, replaced, root, sources, keep_ids):
+        # An old id can only be removed once no other live source, under any root, still maps to the same content.
+        return [
+            doc_id for doc_id in set(replaced)
+            if doc_id not in keep_ids and not self.manifest.is_referenced(doc_id, root, excluding=sources)
+        ]
 
-    def push_to_db(self,directory_path):
+    def push_to_db(self, directory_path, batch_size=512, chunk_size=128):
         try:
-            logger.info("Loading documents from JSON files...")
-            docs = LoadJSON.load_documents(directory_path)
-            logger.info(f"Loaded {len(docs)} documents.")
-            
-            logger.info("Pushing documents to vector store...")
-            vector_store = VectorStore()
-            vector_store.add_documents(docs)
-            logger.info("Documents pushed to vector store successfully.")
+            logger.info("Streaming documents from JSON files into the vector store...")
+            root = os.path.abspath(directory_path)
+            seen_sources, unreadable = set(), []
+            total, pushed, failed = 0, 0, 0
+            for batch in LoadJSON.iter_documents(directory_path, batch_size=batch_size, failures=unreadable):
+                total += len(batch)
+                batch_sources = [doc.metadata["source"] for doc in batch]
+                seen_sources.update(batch_sources)
+                self.manifest.claim(batch_sources, root)
+                changed = self.manifest.diff(batch, root)
+                if not changed:
+                    continue
+
+                uploaded = set(self.vector_store.add_documents_bulk(
+                    [doc for doc, _, _ in changed],
+                    ids=[doc_id for _, doc_id, _ in changed],
+                    chunk_size=chunk_size,
+                ))
+                # Only chunks that made it into the store are recorded, so failed ones are retried next run.
+                failed += sum(1 for entry in changed if entry[1] not in uploaded)
+                changed = [entry for entry in changed if entry[1] in uploaded]
+                if not changed:
+                    continue
+
+                docs = [doc for doc, _, _ in changed]
+                ids = [doc_id for _, doc_id, _ in changed]
+                sources = [doc.metadata["source"] for doc in docs]
+                replaced = [previous for _, _, previous in changed if previous]
+                self.vector_store.delete_documents(self._stale_ids(replaced, root, sources, set(ids)))
+                self.manifest.record(zip(docs, ids), root)
+                pushed += len(docs)
+                logger.info(f"Pushed {pushed} new or changed documents so far ({total} scanned).")
+
+            # Only files of this root that are gone from disk are tombstoned, and nothing at all if some files
+            # failed to parse: a partial view of the folder must not delete documents.
+            missing = [] if unreadable else self.manifest.missing_sources(seen_sources, root)
+            if unreadable:
+                logger.warning(f"Skipping removal of deleted sources: {len(unreadable)} files could not be parsed.")
+            if missing:
+                sources = [source for source, _ in missing]
+                self.vector_store.delete_documents(self._stale_ids([doc_id for _, doc_id in missing], root, sources, set()))
+                self.manifest.tombstone(sources, root)
+                logger.info(f"Tombstoned {len(missing)} documents whose source files were removed.")
+
+            self.vector_store.flush()
+            logger.info(
+                f"Ingestion finished: {total} documents scanned, {pushed} pushed, {failed} failed, "
+                f"{total - pushed - failed} unchanged."
+            )
         except Exception as e:
             logger.error(f"Error pushing documents to DB: {e}")
             raise TutorException(e, sys)
@@ -0,0 +1,195 @@
+'''
+This file provides a process-wide pool of long-lived MCP server processes.
+Each server is spawned once over stdio, health-checked with pings, and shared by every client in the process;
+a single ClientSession multiplexes many concurrent tool calls, so callers only lease a session for each call.
+'''
+import sys
+import time
+import asyncio
+from pathlib import Path
+from contextlib import asynccontextmanager
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+from Tutor.Config.Params import get_param
+
+
+class _PooledServer:
+    def __init__(self, name: str, script_path: str):
+        self.name = name
+        self.script_path = script_path
+        self.session = None
+        self.in_flight = 0
+        self.last_checked = 0.0
+        self._task = None
+        self._ready = asyncio.Event()
+        self._error = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error:
+            raise TutorException(f"[{self.name}] Failed to start MCP server: {self._error}", sys)
+        self.last_checked = time.monotonic()
+
+    async def _run(self):
+        # stdio_client and ClientSession must be entered and exited in the same task, so they live here.
+        try:
+            project_root = str(Path(__file__).resolve().parent.parent.parent)
+            server_params = StdioServerParameters(command="python", args=[self.script_path], cwd=project_root)
+
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    tools = (await session.list_tools()).tools
+                    logger.info("[%s] Pooled MCP server started with tools: %s", self.name, [tool.name for tool in tools])
+                    self.session = session
+                    self._ready.set()
+                    await asyncio.Future()  # Block until cancelled
+        except asyncio.CancelledError:
+            logger.info(f"[{self.name}] Pooled MCP server shutdown requested.")
+        except Exception as e:
+            logger.error(f"[{self.name}] Pooled MCP server error: {e}")
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()  # Unblock start() even if the server failed
+
+    async def healthy(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            self.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"[{self.name}] Health check failed: {e}")
+            return False
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class MCPSessionPool:
+    _pools = {}
+
+    def __init__(self, script_path: str, name: str, size: int = 1, health_check_interval: float = 30, ping_timeout: float = 5):
+        self.script_path = script_path
+        self.name = name
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self._servers = []
+        self._starting = {}  # slot index -> future of the server replacing it
+        self._lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+
+    @classmethod
+    def get(cls, script_path: str, name: str):
+        '''
+        Returns the shared pool for a server script, creating it on first use in the running event loop.
+        '''
+        script_path = str(Path(script_path).resolve())
+        pool = cls._pools.get(script_path)
+        if pool is None or pool._loop is not asyncio.get_running_loop():
+            pool = cls(
+                script_path,
+                name,
+                size=get_param("mcp.pool_size", 1),
+                health_check_interval=get_param("mcp.health_check_interval", 30),
+            )
+            cls._pools[script_path] = pool
+        return pool
+
+    async def _replace(self, index: int, server: _PooledServer):
+        '''
+        Restarts the server in slot `index` without holding the pool lock, so calls routed to healthy servers
+        are not blocked while it spawns. Callers that find the same dead server await the slot's "starting" future.
+        '''
+        starting = self._starting.get(index)
+        if starting is None:
+            if self._servers[index] is not server:
+                return self._servers[index]  # Already replaced by another caller.
+            starting = asyncio.get_running_loop().create_future()
+            self._starting[index] = starting
+            try:
+                logger.warning(f"[{self.name}] Restarting unhealthy MCP server.")
+                await server.stop()
+                replacement = _PooledServer(self.name, self.script_path)
+                await replacement.start()
+                if index >= len(self._servers) or self._servers[index] is not server:
+                    await replacement.stop()
+                    raise TutorException(f"[{self.name}] Pool was closed while restarting a server.", sys)
+                self._servers[index] = replacement
+                starting.set_result(replacement)
+            except BaseException as e:
+                # Waiters must not be cancelled by the restarting caller's own cancellation.
+                failure = e if isinstance(e, Exception) else TutorException(f"[{self.name}] Server restart interrupted.", sys)
+                starting.set_exception(failure)
+                starting.exception()  # Mark retrieved so a failure nobody waited on is not logged as unhandled.
+                raise
+            finally:
+                self._starting.pop(index, None)
+        return await asyncio.shield(starting)
+
+    async def start(self):
+        '''
+        Lazily spawns the pool's servers; a no-op once they are running.
+        '''
+        if not Path(self.script_path).exists():
+            raise TutorException(f"[{self.name}] Server script not found: {self.script_path}", sys)
+        async with self._lock:
+            while len(self._servers) < self.size:
+                logger.info(f"[{self.name}] Spawning pooled MCP server {len(self._servers) + 1}/{self.size}: {self.script_path}")
+                server = _PooledServer(self.name, self.script_path)
+                await server.start()
+                self._servers.append(server)
+
+    async def _pick(self):
+        await self.start()
+        index = min(range(len(self._servers)), key=lambda i: self._servers[i].in_flight)
+        server = self._servers[index]
+        if index in self._starting:
+            return await asyncio.shield(self._starting[index])
+        stale = time.monotonic() - server.last_checked > self.health_check_interval
+        if not server.alive or (stale and server.in_flight == 0 and not await server.healthy(self.ping_timeout)):
+            server = await self._replace(index, server)
+        return server
+
+    @asynccontextmanager
+    async def lease(self):
+        server = await self._pick()
+        server.in_flight += 1
+        try:
+            yield server.session
+        finally:
+            server.in_flight -= 1
+
+    async def call_tool(self, tool_name: str, arguments: dict):
+        async with self.lease() as session:
+            return await session.call_tool(tool_name, arguments)
+
+    async def close(self):
+        async with self._lock:
+            for server in self._servers:
+                await server.stop()
+            self._servers = []
+        logger.info(f"[{self.name}] Pool closed.")
+
+    @classmethod
+    async def close_all(cls):
+        pools = list(cls._pools.values())
+        cls._pools.clear()
+        for pool in pools:
+            if pool._loop is asyncio.get_running_loop():
+                await pool.close()
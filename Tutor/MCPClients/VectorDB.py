@@ -1,74 +1,88 @@
 import sys
-import asyncio
 from pathlib import Path
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.MCPClients.SessionPool import MCPSessionPool
 
 
 class VectorDBClient:
     def __init__(self, script_path: str = "Tutor/MCPServers/VectorDB.py"):
         self.script_path = str(Path(script_path).resolve())
-        self.session = None
-        self._task = None
-        self._session_ready = asyncio.Event()
+        self.pool = None
 
     async def connect(self):
-        if not Path(self.script_path).exists():
-            raise TutorException(f"Server script not found: {self.script_path}", sys)
+        # Servers are shared process-wide; the first connect spawns one, later ones reuse it.
+        logger.info("[VectorDBClient] Leasing VectorDB MCP server from the session pool...")
+        self.pool = MCPSessionPool.get(self.script_path, "VectorDBClient")
+        await self.pool.start()
 
-        logger.info(f"[VectorDBClient] Server script found: {self.script_path}")
-        logger.info("[VectorDBClient] Initializing VectorDB MCP Client...")
-
-        self._task = asyncio.create_task(self._run())
-
-        # Wait until session is initialized
-        await self._session_ready.wait()
+    async def retrieve_documents(
+        self,
+        query: str,
+        threshold: float = 0.5,
+        num_results: int = 5,
+        topic: str = None,
+        difficulty: str = None,
+        level: int = None,
+    ):
+        if not self.pool:
+            raise TutorException("Client not connected. Call connect() first.", sys)
 
-    async def _run(self):
+        logger.info(f"[VectorDBClient] Retrieving documents for query: {query}")
         try:
-            project_root = str(Path(__file__).resolve().parent.parent.parent)
-            server_params = StdioServerParameters(command="python", args=[self.script_path], cwd=project_root)
-
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    logger.info("[VectorDBClient] Client session created successfully.")
-                    await session.initialize()
-                    tools = (await session.list_tools()).tools
-                    logger.info("[VectorDBClient] Connected with tools: %s", [tool.name for tool in tools])
-
-                    self.session = session
-                    self._session_ready.set()
-
-                    await asyncio.Future()  # Block forever until cancelled
-        except asyncio.CancelledError:
-            logger.info("[VectorDBClient] Shutdown requested.")
+            arguments = {
+                "query": query,
+                "threshold": threshold,
+                "num_results": num_results
+            }
+            filters = {"topic": topic, "difficulty": difficulty, "level": level}
+            arguments.update({key: value for key, value in filters.items() if value is not None})
+            result = await self.pool.call_tool("retrieve_documents", arguments)
+            return result
         except Exception as e:
-            logger.error(f"[VectorDBClient] MCP client error: {e}")
-            self._session_ready.set()  # Unblock connect even if failed
+            logger.error(f"[VectorDBClient] Error retrieving documents: {e}")
+            raise TutorException(e, sys)
 
-    async def retrieve_documents(self, query: str, threshold: float = 0.5, num_results: int = 5):
-        if not self.session:
+    async def retrieve_documents_batch(
+        self,
+        queries: list,
+        threshold: float = 0.5,
+        num_results: int = 5,
+        topic: str = None,
+        difficulty: str = None,
+        level: int = None,
+    ):
+        if not self.pool:
             raise TutorException("Client not connected. Call connect() first.", sys)
 
-        logger.info(f"[VectorDBClient] Retrieving documents for query: {query}")
+        logger.info(f"[VectorDBClient] Retrieving documents for {len(queries)} queries")
         try:
-            result = await self.session.call_tool("retrieve_documents", {
-                "query": query,
+            arguments = {
+                "queries": list(queries),
                 "threshold": threshold,
                 "num_results": num_results
-            })
+            }
+            filters = {"topic": topic, "difficulty": difficulty, "level": level}
+            arguments.update({key: value for key, value in filters.items() if value is not None})
+            result = await self.pool.call_tool("retrieve_documents_batch", arguments)
             return result
         except Exception as e:
-            logger.error(f"[VectorDBClient] Error retrieving documents: {e}")
+            logger.error(f"[VectorDBClient] Error retrieving documents in batch: {e}")
+            raise TutorException(e, sys)
+
+    async def add_documents(self, questions: list, source: str = "scraped"):
+        if not self.pool:
+            raise TutorException("Client not connected. Call connect() first.", sys)
+
+        logger.info(f"[VectorDBClient] Adding {len(questions)} questions to the vector store")
+        try:
+            result = await self.pool.call_tool("add_documents", {"questions": list(questions), "source": source})
+            return result
+        except Exception as e:
+            logger.error(f"[VectorDBClient] Error adding documents: {e}")
             raise TutorException(e, sys)
 
     async def close(self):
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-        logger.info("[VectorDBClient] Closed.")
\ No newline at end of file
+        # The pooled server stays up for other callers; MCPSessionPool.close_all() stops it at shutdown.
+        self.pool = None
+        logger.info("[VectorDBClient] Released.")
\ No newline at end of file
@@ -1,61 +1,27 @@
 import sys
-import asyncio
 from pathlib import Path
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.MCPClients.SessionPool import MCPSessionPool
 
 
 class WebScrapeClient:
     def __init__(self, script_path: str = "Tutor/MCPServers/WebScrape.py"):
         self.script_path = str(Path(script_path).resolve())
-        self.session = None
-        self._task = None
-        self._session_ready = asyncio.Event()
+        self.pool = None
 
     async def connect(self):
-        if not Path(self.script_path).exists():
-            raise TutorException(f"[WebScrapeClient] Server script not found: {self.script_path}", sys)
-        logger.info(f"[WebScrapeClient] Server script found: {self.script_path}")
-        logger.info("[WebScrapeClient] Initializing WebScrape MCP Client...")
-
-        self._task = asyncio.create_task(self._run())
-        await self._session_ready.wait()
-
-    async def _run(self):
-        try:
-            project_root = str(Path(__file__).resolve().parent.parent.parent)
-            server_params = StdioServerParameters(command="python", args=[self.script_path], cwd=project_root)
-
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    logger.info("[WebScrapeClient] Client session created successfully.")
-                    await session.initialize()
-                    logger.info("[WebScrapeClient] Connected successfully.")
-
-                    tools = (await session.list_tools()).tools
-                    logger.info("[WebScrapeClient] Connected with tools: %s", [tool.name for tool in tools])
-
-                    self.session = session
-                    self._session_ready.set()
-
-                    # Keep the session alive
-                    await asyncio.Event().wait()
-
-        except asyncio.CancelledError:
-            logger.info("[WebScrapeClient] Shutdown requested.")
-        except Exception as e:
-            logger.error(f"[WebScrapeClient] MCP client error: {e}")
-            self._session_ready.set()
-
+        # Servers are shared process-wide; the first connect spawns one, later ones reuse it.
+        logger.info("[WebScrapeClient] Leasing WebScrape MCP server from the session pool...")
+        self.pool = MCPSessionPool.get(self.script_path, "WebScrapeClient")
+        await self.pool.start()
 
     async def scrape(self, url: str):
-        if not self.session:
+        if not self.pool:
             raise TutorException("[WebScrapeClient] Client not connected. Call connect() first.", sys)
         try:
             logger.info(f"[WebScrapeClient] Scraping URL: {url}")
-            result = await self.session.call_tool("scrape_info", {"url": url})
+            result = await self.pool.call_tool("scrape_info", {"url": url})
             logger.info("[WebScrapeClient] Scraping completed.")
             return result
         except Exception as e:
@@ -63,10 +29,6 @@ class WebScrapeClient:
             raise TutorException(e, sys)
 
     async def close(self):
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-        logger.info("[WebScrapeClient] Closed.")
\ No newline at end of file
+        # The pooled server stays up for other callers; MCPSessionPool.close_all() stops it at shutdown.
+        self.pool = None
+        logger.info("[WebScrapeClient] Released.")
\ No newline at end of file
@@ -3,9 +3,14 @@ This file is essentially used to create a MCP server that provides our VectorDB
 '''
 import sys
 import os
+import asyncio
+from typing import List, Optional, Dict, Any
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 from mcp.server.fastmcp import FastMCP
 from Tutor.Services.VectorStore import VectorStore
+from Tutor.Services.EmbeddingBatcher import EmbeddingBatcher
+from Tutor.Data.Metadata import build_filters
+from Tutor.Data.Enrichment import questions_to_documents
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 
@@ -16,6 +21,7 @@ class VectorDBServer:
             logger.info("Creating VectorStore instance...")
             self.store = VectorStore(model_name="sentence-transformers/all-mpnet-base-v2")
             logger.info("VectorStore instance created successfully.")
+            self.batcher = EmbeddingBatcher(self.store.embedding_model)
             logger.info("Creating FastMCP instance...")
             self.mcp = FastMCP("vector-db")
             logger.info("FastMCP instance created successfully.")
@@ -25,7 +31,14 @@ class VectorDBServer:
             raise TutorException(e, sys)
 
         @self.mcp.tool()
-        def retrieve_documents(query: str, threshold: float = 0.5, num_results: int = 5):
+        async def retrieve_documents(
+            query: str,
+            threshold: float = 0.5,
+            num_results: int = 5,
+            topic: Optional[str] = None,
+            difficulty: Optional[str] = None,
+            level: Optional[int] = None,
+        ):
             """
             Retrieve relevant documents from the vector store using similarity search.
 
@@ -33,20 +46,97 @@ class VectorDBServer:
                 query: The user question or prompt.
                 threshold: Minimum similarity score (0 to 1).
                 num_results: Maximum number of documents to return.
+                topic: Optional topic filter, e.g. "algebra", "geometry", "number theory".
+                difficulty: Optional difficulty filter: "easy", "medium" or "hard".
+                level: Optional MATH level filter (1 to 5).
 
             Returns:
                 A list of matching documents.
             """
             try:
                 if not query:
-                    raise TutorException("Query cannot be empty", sys)
+                    raise ValueError("Query cannot be empty")
+                filters = build_filters(topic=topic, difficulty=difficulty, level=level)
 
-                logger.info(f"[VectorDB MCP Server] Retrieving documents for query: {query} with threshold: {threshold} and num_results: {num_results}")
-                return self.store.retrieve(query, threshold, num_results)
+                logger.info(f"[VectorDB MCP Server] Retrieving documents for query: {query} with threshold: {threshold}, num_results: {num_results} and filters: {filters}")
+                # Concurrent calls share one batched forward pass through the micro-batcher.
+                embedding = await self.batcher.embed_query(query)
+                return await asyncio.to_thread(self.store.retrieve_by_vector, embedding, threshold, num_results, filters)
+            except ValueError as ve:
+                logger.error(f"[VectorDB MCP Server] Invalid retrieval request: {ve}")
+                raise TutorException(ve, sys)
             except TutorException as e:
                 logger.error(f"[VectorDB MCP Server] Error occurred while retrieving documents: {e}")
                 raise TutorException(e, sys)
 
+        @self.mcp.tool()
+        async def retrieve_documents_batch(
+            queries: List[str],
+            threshold: float = 0.5,
+            num_results: int = 5,
+            topic: Optional[str] = None,
+            difficulty: Optional[str] = None,
+            level: Optional[int] = None,
+        ):
+            """
+            Retrieve relevant documents for many queries in one call.
+
+            Args:
+                queries: The user questions or prompts.
+                threshold: Minimum similarity score (0 to 1).
+                num_results: Maximum number of documents to return per query.
+                topic: Optional topic filter applied to every query.
+                difficulty: Optional difficulty filter applied to every query.
+                level: Optional MATH level filter applied to every query.
+
+            Returns:
+                A mapping from each query to its list of matching documents.
+            """
+            try:
+                if not queries or any(not query for query in queries):
+                    raise ValueError("Queries cannot be empty")
+                filters = build_filters(topic=topic, difficulty=difficulty, level=level)
+
+                logger.info(f"[VectorDB MCP Server] Retrieving documents for {len(queries)} queries with threshold: {threshold}, num_results: {num_results} and filters: {filters}")
+                embeddings = await asyncio.to_thread(self.store.embedding_model.embed_queries, queries)
+                results = await asyncio.to_thread(self.store.retrieve_batch_by_vectors, embeddings, threshold, num_results, filters)
+                return dict(zip(queries, results))
+            except ValueError as ve:
+                logger.error(f"[VectorDB MCP Server] Invalid batch retrieval request: {ve}")
+                raise TutorException(ve, sys)
+            except TutorException as e:
+                logger.error(f"[VectorDB MCP Server] Error occurred while retrieving documents in batch: {e}")
+                raise TutorException(e, sys)
+
+        @self.mcp.tool()
+        async def add_documents(questions: List[Dict[str, Any]], source: str = "scraped"):
+            """
+            Upsert extracted question/answer pairs into the vector store.
+
+            Args:
+                questions: Dicts with "question", "answer" and optional "topic" and "difficulty" keys.
+                source: Where the questions came from, stored as document metadata.
+
+            Returns:
+                Counts of questions received, unique documents and documents upserted.
+            """
+            try:
+                if not questions:
+                    raise ValueError("Questions cannot be empty")
+                documents, ids = questions_to_documents(questions, source=source)
+                logger.info(f"[VectorDB MCP Server] Upserting {len(documents)} unique documents from {len(questions)} questions")
+                uploaded = []
+                if documents:
+                    uploaded = await asyncio.to_thread(self.store.add_documents_bulk, documents, ids)
+                    await asyncio.to_thread(self.store.flush)
+                return {"received": len(questions), "unique": len(documents), "upserted": len(uploaded)}
+            except ValueError as ve:
+                logger.error(f"[VectorDB MCP Server] Invalid add_documents request: {ve}")
+                raise TutorException(ve, sys)
+            except TutorException as e:
+                logger.error(f"[VectorDB MCP Server] Error occurred while adding documents: {e}")
+                raise TutorException(e, sys)
+
     def serve(self):
         try:
             logger.info(" [VectorDB MCP Server] Starting VectorDB MCP Server...")
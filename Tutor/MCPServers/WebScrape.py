@@ -4,9 +4,12 @@ This script will be used to create a MCP server that provides our WebScrape serv
 
 import sys
 import os
+import asyncio
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 from mcp.server.fastmcp import FastMCP
 from Tutor.Tools.WebScrape import WebScrape
+from Tutor.Tools.ScrapeCache import ScrapeCache
+from Tutor.Config.Params import get_param
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 
@@ -17,6 +20,10 @@ class WebScrapeServer:
             logger.info("[WebScrape MCP Server] Creating WebScrape instance...")
             self.web_scrape = WebScrape()
             logger.info("[WebScrape MCP Server] WebScrape instance created successfully.")
+            self.cache = ScrapeCache(
+                db_path=get_param("scrape_cache.db_path", "Tutor/Artifacts/ScrapeCache/scrape_cache.sqlite"),
+                ttl_seconds=get_param("scrape_cache.ttl_seconds", 7 * 24 * 3600),
+            ) if get_param("scrape_cache.enabled", True) else None
             logger.info("[WebScrape MCP Server] Creating FastMCP instance...")
             self.mcp = FastMCP("web-scrape")
             logger.info("[WebScrape MCP Server] FastMCP instance created successfully.")
@@ -26,6 +33,19 @@ class WebScrapeServer:
             raise TutorException(e, sys)
         
         scraping_tool = self.web_scrape
+        cache = self.cache
+
+        async def cached_scrape(url: str):
+            # Cache lookups touch SQLite, so they run in a worker thread.
+            if cache:
+                documents = await asyncio.to_thread(cache.get, url)
+                if documents is not None:
+                    return documents
+            documents = await scraping_tool.ascrape(url=url)
+            if cache:
+                await asyncio.to_thread(cache.put, url, documents)
+            return documents
+
         @self.mcp.tool()
         async def scrape_info(url: str):
             """
@@ -37,7 +57,7 @@ class WebScrapeServer:
             """
             try:
                 logger.info("[WebScrape MCP Server] Providing WebScrape service...")
-                result = scraping_tool.scrape(url=url)
+                result = await cached_scrape(url)
                 logger.info("[WebScrape MCP Server] WebScrape service provided successfully.")
                 return result
             except TutorException as e:
@@ -6,6 +6,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 from mcp.server.fastmcp import FastMCP
 from Tutor.Tools.WebSearch import WebSearch
+from Tutor.Tools.SearchCache import SearchCache
+from Tutor.Config.Params import get_param
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 
@@ -22,7 +24,12 @@ class WebSearchServer:
             logger.info("Initializing WebSearch MCP Server...")
             logger.info("Creating WebSearch instance...")
             logger.info(f"TAVILY_API_KEY exists: {'TAVILY_API_KEY' in os.environ}")
+            self.max_results = max_results
             self.search_tool = WebSearch(max_results=max_results)
+            self.cache = SearchCache(
+                ttl_seconds=get_param("search_cache.ttl_seconds", 3600),
+                max_size=get_param("search_cache.max_size", 1024),
+            )
             logger.info("WebSearch instance created successfully.")
             logger.info("Creating FastMCP instance...")
             self.mcp = FastMCP("web-search")
@@ -33,7 +40,7 @@ class WebSearchServer:
             raise TutorException(e, sys)
 
         @self.mcp.tool()
-        def search(query: str):
+        async def search(query: str):
             """
             Perform a web search using the provided query string.
 
@@ -45,10 +52,25 @@ class WebSearchServer:
             """
             try:
                 logger.info(f"[WebSearch MCP Server] Searching for query: {query}")
-                return self.search_tool.search(query=query)
+                # Identical concurrent queries share one Tavily call; repeats within the TTL are served from memory.
+                return await self.cache.get_or_fetch(
+                    query,
+                    self.max_results,
+                    lambda: self.search_tool.asearch(query=query),
+                )
             except TutorException as e:
                 logger.error(f"[WebSearch MCP Server] Error occurred while searching: {e}")
                 raise TutorException(e, sys)
+
+        @self.mcp.tool()
+        def search_cache_stats():
+            """
+            Report hit, miss and coalescing counts for the search result cache.
+
+            Returns:
+                A dict of cache statistics.
+            """
+            return self.cache.stats()
         
     def serve(self):
         try:
@@ -0,0 +1,109 @@
+'''
+This file turns scraped pages into compact plain text before they are sent to ScrapeLLM.
+Markup, navigation and other boilerplate are stripped, the math-bearing regions of the page are kept
+(LaTeX, equations and Problem/Solution blocks, with a few lines of context), and the result is capped
+to a per-page token budget.
+'''
+import re
+import sys
+import json
+from bs4 import BeautifulSoup
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+from Tutor.Services.RateLimiter import estimate_tokens
+
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg", "button"]
+HTML_PATTERN = re.compile(r"<\s*(html|body|div|p|span|table|br)\b", re.IGNORECASE)
+MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MATH_PATTERN = re.compile(
+    r"(\$[^$]+\$|\\\(|\\\[|\\(frac|sqrt|sum|int|cdot|times|pi|theta|leq|geq|binom)\b"
+    r"|\b(problem|solution|question|answer|exercise|example|prove|find|solve|evaluate|compute)\b"
+    r"|\d\s*[-+*/^=<>]\s*\d|[a-z]\s*\^\s*\d|=\s*-?\d)",
+    re.IGNORECASE,
+)
+
+
+class ContentCleaner:
+    def __init__(self, max_tokens: int = 2000, context_lines: int = 3, min_line_chars: int = 3):
+        self.max_tokens = max_tokens
+        self.context_lines = context_lines
+        self.min_line_chars = min_line_chars
+
+    @staticmethod
+    def to_text(raw) -> str:
+        '''
+        Pulls the page text out of whatever the scraper returned: an MCP CallToolResult, a list of
+        serialised langchain Documents, or a plain string.
+        '''
+        if hasattr(raw, "content"):
+            parts = [getattr(item, "text", "") or "" for item in raw.content]
+        elif isinstance(raw, (list, tuple)):
+            parts = [getattr(item, "page_content", None) or str(item) for item in raw]
+        else:
+            parts = [str(raw or "")]
+
+        texts = []
+        for part in parts:
+            try:
+                data = json.loads(part)
+                part = data.get("page_content", part) if isinstance(data, dict) else part
+            except (ValueError, TypeError):
+                pass
+            texts.append(part)
+        return "\n\n".join(t for t in texts if t)
+
+    @staticmethod
+    def _strip_markup(text: str) -> str:
+        if HTML_PATTERN.search(text):
+            soup = BeautifulSoup(text, "html.parser")
+            for tag in soup(BOILERPLATE_TAGS):
+                tag.decompose()
+            text = soup.get_text("\n")
+        text = MARKDOWN_IMAGE.sub("", text)
+        return MARKDOWN_LINK.sub(r"\1", text)
+
+    def _lines(self, text: str):
+        lines = []
+        for line in text.splitlines():
+            line = " ".join(line.split())
+            if len(line) < self.min_line_chars:
+                continue
+            # Navigation menus and footers survive as runs of very short, unpunctuated lines.
+            if len(line.split()) <= 2 and not MATH_PATTERN.search(line) and not line.endswith((".", "?", ":")):
+                continue
+            if lines and lines[-1] == line:
+                continue
+            lines.append(line)
+        return lines
+
+    def _math_regions(self, lines):
+        keep = set()
+        for i, line in enumerate(lines):
+            if MATH_PATTERN.search(line):
+                keep.update(range(max(0, i - self.context_lines), min(len(lines), i + self.context_lines + 1)))
+        return [lines[i] for i in sorted(keep)] if keep else lines
+
+    def _cap(self, text: str) -> str:
+        max_chars = self.max_tokens * 4
+        if len(text) <= max_chars:
+            return text
+        cut = text.rfind("\n", 0, max_chars)
+        return text[:cut if cut > max_chars // 2 else max_chars]
+
+    def clean(self, raw, name: str = "page"):
+        '''
+        Returns (cleaned_text, stats) where stats holds the estimated tokens before and after cleaning.
+        '''
+        try:
+            original = self.to_text(raw)
+            lines = self._lines(self._strip_markup(original))
+            cleaned = self._cap("\n".join(self._math_regions(lines)))
+
+            before, after = estimate_tokens(original), estimate_tokens(cleaned) if cleaned else 0
+            stats = {"tokens_before": before, "tokens_after": after, "tokens_saved": before - after}
+            logger.info(f"[ContentCleaner] {name}: {before} -> {after} tokens ({stats['tokens_saved']} saved).")
+            return cleaned, stats
+        except Exception as e:
+            logger.error(f"[ContentCleaner] Error cleaning {name}.")
+            raise TutorException(e, sys)
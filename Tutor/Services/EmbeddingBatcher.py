@@ -0,0 +1,71 @@
+'''
+This file provides an async micro-batcher that groups concurrent query embeddings into one forward pass.
+'''
+import sys
+import asyncio
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+class EmbeddingBatcher:
+    def __init__(self, embedding_model, max_batch_size: int = 32, max_wait_ms: float = 5):
+        self.embedding_model = embedding_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def embed_query(self, text: str):
+        try:
+            if not text or not text.strip():
+                raise ValueError("Text to embed cannot be empty or just whitespace.")
+        except ValueError as ve:
+            logger.error(f"[EmbeddingBatcher] Embedding error: {ve}")
+            raise TutorException(ve, sys)
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(self.embedding_model.embed_queries, texts)
+                logger.debug(f"[EmbeddingBatcher] Embedded micro-batch of {len(batch)} queries.")
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+            except Exception as e:
+                logger.error(f"[EmbeddingBatcher] Error embedding micro-batch: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def close(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
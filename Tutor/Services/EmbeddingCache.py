@@ -0,0 +1,135 @@
+'''
+This file provides the caches used by EmbeddingModel to avoid re-running the sentence-transformer on repeated text.
+'''
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+class QueryEmbeddingCache:
+    '''
+    Bounded in-memory LRU cache with a TTL, keyed on (model_name, normalized text).
+    '''
+    def __init__(self, max_size: int = 2048, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_name: str, text: str):
+        key = (model_name, normalize_text(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, model_name: str, text: str, vector):
+        if self.max_size <= 0:
+            return
+        key = (model_name, normalize_text(text))
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+class PersistentEmbeddingCache:
+    '''
+    On-disk float32 embedding cache in SQLite, keyed on (model_name, sha256 of the kind and text).
+    `kind` ("query" or "document") keeps vectors apart for models that embed the two differently.
+    WAL mode lets the VectorDB server, ingestion jobs and other workers on the same node share one file.
+    '''
+    def __init__(self, db_path: str = "Tutor/Artifacts/EmbeddingCache/embeddings.sqlite"):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model_name, text_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads, so each thread opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _hash(text: str, kind: str) -> str:
+        return hashlib.sha256(f"{kind}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, texts: list, kind: str = "document") -> list:
+        hashes = [self._hash(text, kind) for text in texts]
+        found = {}
+        conn = self._connection()
+        unique = list(set(hashes))
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model_name = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                [model_name, *chunk],
+            )
+            for text_hash, blob in rows:
+                found[text_hash] = array("f", blob).tolist()
+
+        vectors = [found.get(text_hash) for text_hash in hashes]
+        hits = sum(1 for vector in vectors if vector is not None)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(self, model_name: str, texts: list, vectors: list, kind: str = "document"):
+        conn = self._connection()
+        conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (model_name, text_hash, vector) VALUES (?, ?, ?)",
+            [(model_name, self._hash(text, kind), array("f", vector).tobytes()) for text, vector in zip(texts, vectors)],
+        )
+        conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -5,9 +5,16 @@ load_dotenv()
 from langchain_huggingface.embeddings import HuggingFaceEmbeddings
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Services.EmbeddingCache import QueryEmbeddingCache, PersistentEmbeddingCache, normalize_text
 
 class EmbeddingModel:
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        cache_size: int = 2048,
+        cache_ttl: float = 3600,
+        disk_cache_path: str = "Tutor/Artifacts/EmbeddingCache/embeddings.sqlite",
+    ):
         try:
             if not model_name:
                 raise ValueError("Model name cannot be empty.")
@@ -17,6 +24,8 @@ class EmbeddingModel:
             
             self.model_name = model_name
             self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
+            self.query_cache = QueryEmbeddingCache(max_size=cache_size, ttl_seconds=cache_ttl)
+            self.disk_cache = PersistentEmbeddingCache(db_path=disk_cache_path) if disk_cache_path else None
             logger.info(f"Embedding model '{model_name}' initialized successfully.")
         except ValueError as ve:
             logger.error(f"Initialization error: {ve}")
@@ -29,10 +38,20 @@ class EmbeddingModel:
         try:
             if not text or text.strip() == "":
                 raise ValueError("Text to embed cannot be empty or just whitespace.")
-            logger.info(f"Embedding text: {text[:30]}...")
-            embeddings = self.embeddings.embed_query(text=text)
-            logger.info(f"Embedding result: {embeddings[:10]}...")
-            return self.embeddings.embed_query(text=text)
+            cached = self.query_cache.get(self.model_name, text)
+            if cached is not None:
+                logger.debug(f"Query embedding cache hit: {text[:30]}...")
+                return cached
+
+            normalized = normalize_text(text)
+            embedding = self._disk_get([normalized], "query")[0]
+            if embedding is None:
+                logger.info(f"Embedding text: {text[:30]}...")
+                embedding = self.embeddings.embed_query(text=normalized)
+                logger.debug(f"Embedding result: {embedding[:10]}...")
+                self._disk_put([normalized], [embedding], "query")
+            self.query_cache.put(self.model_name, text, embedding)
+            return embedding
 
         except ValueError as ve:
             logger.error(f"Embedding error: {ve}") 
@@ -41,16 +60,83 @@ class EmbeddingModel:
             logger.error("Error embedding text...")
             raise TutorException(e, sys)
         
+    def embed_queries(self, texts: list):
+        '''
+        Embeds several queries with one forward pass over the ones not already cached.
+        '''
+        try:
+            if not texts or any(not text or not text.strip() for text in texts):
+                raise ValueError("Texts to embed cannot be empty or just whitespace.")
+
+            vectors = {}
+            for text in texts:
+                normalized = normalize_text(text)
+                if normalized not in vectors:
+                    vectors[normalized] = self.query_cache.get(self.model_name, text)
+
+            missing = [normalized for normalized, vector in vectors.items() if vector is None]
+            if missing:
+                vectors.update((k, v) for k, v in zip(missing, self._disk_get(missing, "query")) if v is not None)
+                missing = [normalized for normalized in missing if vectors[normalized] is None]
+
+            if missing:
+                logger.info(f"Embedding batch of {len(missing)} queries...")
+                if getattr(self.embeddings, "query_encode_kwargs", None):
+                    # Queries get their own prompt/prefix here, so they cannot share the document batch path.
+                    embedded = [self.embeddings.embed_query(text=normalized) for normalized in missing]
+                else:
+                    embedded = self.embeddings.embed_documents(missing)
+                vectors.update(zip(missing, embedded))
+                self._disk_put(missing, embedded, "query")
+
+            for normalized, vector in vectors.items():
+                self.query_cache.put(self.model_name, normalized, vector)
+            return [vectors[normalize_text(text)] for text in texts]
+        except ValueError as ve:
+            logger.error(f"Embedding error: {ve}")
+            raise TutorException(ve, sys)
+        except Exception as e:
+            logger.error("Error embedding queries...")
+            raise TutorException(e, sys)
+
     def embed_documents(self, texts: list):
         try:
             if not texts:
                 raise ValueError("List of texts to embed cannot be empty.")
             
-            logger.info(f"Embedding {len(texts)} documents...")
-            return self.embeddings.embed_documents(texts)
+            normalized = [normalize_text(text) for text in texts]
+            unique = list(dict.fromkeys(normalized))
+            vectors = dict(zip(unique, self._disk_get(unique, "document")))
+            missing = [text for text, vector in vectors.items() if vector is None]
+
+            if missing:
+                logger.info(f"Embedding {len(missing)} documents...")
+                embedded = self.embeddings.embed_documents(missing)
+                vectors.update(zip(missing, embedded))
+                self._disk_put(missing, embedded, "document")
+            return [vectors[text] for text in normalized]
         except ValueError as ve:
             logger.error(f"Embedding documents error: {ve}")
             raise TutorException(ve, sys)
         except Exception as e:
             logger.error("Error embedding documents...")
             raise TutorException(e, sys)
+
+    # The disk cache is keyed on (model, kind, normalized text); callers always embed the normalized text,
+    # and "query"/"document" are kept apart for models that prefix queries and documents differently.
+    def _disk_get(self, texts: list, kind: str) -> list:
+        if not self.disk_cache:
+            return [None] * len(texts)
+        try:
+            return self.disk_cache.get_many(self.model_name, texts, kind)
+        except Exception as e:
+            logger.warning(f"Embedding disk cache lookup failed, embedding from scratch: {e}")
+            return [None] * len(texts)
+
+    def _disk_put(self, texts: list, vectors: list, kind: str):
+        if not self.disk_cache:
+            return
+        try:
+            self.disk_cache.put_many(self.model_name, texts, vectors, kind)
+        except Exception as e:
+            logger.warning(f"Embedding disk cache write failed: {e}")
@@ -0,0 +1,78 @@
+'''
+This file provides process-wide pooled HTTP clients for agent-to-agent calls.
+Each downstream agent gets one long-lived httpx.AsyncClient (keep-alive, HTTP/2 when the h2 package is installed)
+configured from `http_clients` in params.yaml, so repeated A2A requests reuse connections instead of paying
+TCP/TLS setup every time. Clients are created at startup and closed at shutdown by the agent servers.
+'''
+import asyncio
+import httpx
+from Tutor.Logging.Logger import logger
+from Tutor.Config.Params import get_param
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClients:
+    _clients = {}  # name -> (event loop, client)
+
+    @staticmethod
+    def _config(name: str) -> dict:
+        clients = get_param("http_clients", {}) or {}
+        return {**(clients.get("default") or {}), **(clients.get(name) or {})}
+
+    @classmethod
+    def _create(cls, name: str) -> httpx.AsyncClient:
+        config = cls._config(name)
+        timeout = config.get("timeout") or {}
+        http2 = config.get("http2", True) and HTTP2_AVAILABLE
+        client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                connect=timeout.get("connect", 30.0),
+                read=timeout.get("read", 300.0),
+                write=timeout.get("write", 30.0),
+                pool=timeout.get("pool", 30.0),
+            ),
+            limits=httpx.Limits(
+                max_connections=config.get("max_connections", 20),
+                max_keepalive_connections=config.get("max_keepalive_connections", 10),
+                keepalive_expiry=config.get("keepalive_expiry", 30),
+            ),
+        )
+        logger.info(f"[HttpClients] Created pooled client '{name}' (http2={http2}).")
+        return client
+
+    @classmethod
+    def get(cls, name: str) -> httpx.AsyncClient:
+        '''
+        Returns the shared client for a downstream agent, creating it if startup has not done so
+        (or if it belongs to a different event loop, e.g. in scripts that call asyncio.run repeatedly).
+        '''
+        loop = asyncio.get_running_loop()
+        entry = cls._clients.get(name)
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            entry = (loop, cls._create(name))
+            cls._clients[name] = entry
+        return entry[1]
+
+    @classmethod
+    async def start_all(cls):
+        '''
+        Creates a client for every downstream agent configured under `http_clients`.
+        '''
+        for name in get_param("http_clients", {}) or {}:
+            if name != "default":
+                cls.get(name)
+
+    @classmethod
+    async def close_all(cls):
+        clients = list(cls._clients.items())
+        cls._clients.clear()
+        for name, (loop, client) in clients:
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+                logger.info(f"[HttpClients] Closed pooled client '{name}'.")
@@ -0,0 +1,102 @@
+'''
+This file provides an incremental extractor for top-level fields of a JSON object that an LLM is still generating.
+It tolerates the surrounding code fences and commentary, and reports each requested field as soon as its value
+has been closed, so downstream work can start before the model finishes the response.
+'''
+import re
+import json
+
+
+class JsonFieldStream:
+    _SCALAR_END = re.compile(r"[,}\n]")
+    _BLANK_TAIL = re.compile(r"\s*\Z")
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.buffer = ""
+        self.values = {}
+        self._patterns = {field: re.compile(r'"%s"\s*:\s*' % re.escape(field)) for field in self.fields}
+        # Scan positions are kept between feeds so each character is looked at a bounded number of times:
+        # where to resume looking for a field's key, and once found, where its value starts and how far it was scanned.
+        self._key_from = {field: 0 for field in self.fields}
+        self._value_at = {}
+
+    @staticmethod
+    def _scan_string(text, i):
+        # `i` is inside the string, past the opening quote; returns (index of the closing quote or None, resume index).
+        while i < len(text):
+            char = text[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == '"':
+                return i, i
+            i += 1
+        return None, i
+
+    def _key_may_complete(self, field, i):
+        # Whether the text from the quote at `i` to the end of the buffer can still grow into the field's key.
+        key = '"%s"' % field
+        if len(self.buffer) - i < len(key):
+            return key.startswith(self.buffer[i:])
+        return self.buffer.startswith(key, i) and self._BLANK_TAIL.match(self.buffer, i + len(key)) is not None
+
+    def _find_value(self, field):
+        pattern = self._patterns[field]
+        i = self._key_from[field]
+        while True:
+            i = self.buffer.find('"', i)
+            if i == -1:
+                self._key_from[field] = len(self.buffer)
+                return None
+            match = pattern.match(self.buffer, i)
+            if match and match.end() < len(self.buffer):
+                return match.end()
+            if match or self._key_may_complete(field, i):
+                self._key_from[field] = i
+                return None
+            i += 1
+
+    def _extract(self, field):
+        if field not in self._value_at:
+            start = self._find_value(field)
+            if start is None:
+                return None
+            self._value_at[field] = (start, start + 1 if self.buffer[start] == '"' else start)
+        start, scanned = self._value_at[field]
+        if self.buffer[start] == '"':
+            end, scanned = self._scan_string(self.buffer, scanned)
+            if end is None:
+                self._value_at[field] = (start, scanned)
+                return None
+            raw = self.buffer[start:end + 1]
+        else:
+            match = self._SCALAR_END.search(self.buffer, scanned)
+            if match is None:
+                self._value_at[field] = (start, len(self.buffer))
+                return None
+            raw = self.buffer[start:match.start()].strip()
+        try:
+            return json.loads(raw, strict=False)
+        except json.JSONDecodeError:
+            return raw.strip('"')
+
+    def feed(self, text: str) -> dict:
+        '''
+        Appends streamed text and returns the fields completed by it (field -> value).
+        Only text past the previous scan positions is examined, so a whole response is parsed in linear time.
+        '''
+        self.buffer += text
+        completed = {}
+        for field in self.fields:
+            if field in self.values:
+                continue
+            value = self._extract(field)
+            if value is not None:
+                self.values[field] = value
+                completed[field] = value
+        return completed
+
+    @property
+    def done(self) -> bool:
+        return all(field in self.values for field in self.fields)
@@ -0,0 +1,265 @@
+'''
+This file provides the shared LLM-call layer used by ReasoningModel, ScrapeLLM and TeachingModel.
+CachedChain wraps a prompt and a chat model as one chain built at construction time, logs latency, token usage
+and cache hits for every call, and serves byte-identical requests from LLMCache: an on-disk SQLite store keyed on
+(model, hash of the rendered prompt, temperature) that evicts least-recently-used responses beyond a size limit.
+'''
+import os
+import sys
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from langchain_core.messages import AIMessage, AIMessageChunk
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+from Tutor.Config.Params import get_param
+
+
+class LLMCache:
+    _shared = None
+    _unavailable = False
+
+    def __init__(self, db_path: str = "Tutor/Artifacts/LLMCache/responses.sqlite", max_bytes: int = 64 * 1024 * 1024):
+        try:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self.db_path = db_path
+            self.max_bytes = max_bytes
+            self._local = threading.local()
+            conn = self._connection()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
+            self.evicted = 0
+        except Exception as e:
+            logger.error("[LLMCache] Error initializing LLM response cache.")
+            raise TutorException(e, sys)
+
+    @classmethod
+    def shared(cls):
+        '''
+        Returns the process-wide cache configured from `llm_cache` in params.yaml, or None when it is disabled
+        or cannot be opened (models then run uncached rather than failing to start).
+        '''
+        if cls._shared is None and not cls._unavailable and get_param("llm_cache.enabled", True):
+            try:
+                cls._shared = cls(
+                    db_path=get_param("llm_cache.db_path", "Tutor/Artifacts/LLMCache/responses.sqlite"),
+                    max_bytes=int(get_param("llm_cache.max_size_mb", 64) * 1024 * 1024),
+                )
+            except Exception as e:
+                cls._unavailable = True
+                logger.warning(f"[LLMCache] Response cache unavailable, LLM calls will not be cached: {e}")
+        return cls._shared
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads, so each thread opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, messages, temperature) -> str:
+        rendered = json.dumps([[message.type, message.content] for message in messages], ensure_ascii=False)
+        prompt_hash = hashlib.sha256(rendered.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{model}\x00{prompt_hash}\x00{temperature}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        conn = self._connection()
+        row = conn.execute("SELECT payload FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, payload: dict):
+        data = json.dumps(payload, ensure_ascii=False)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, payload, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, model, data, len(data.encode("utf-8")), time.time()),
+        )
+        conn.commit()
+        self._evict(conn)
+
+    def discard(self, key: str):
+        conn = self._connection()
+        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        conn.commit()
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% of the limit so a full cache does not evict on every write.
+        target = int(self.max_bytes * 0.9)
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= target:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        conn.commit()
+        self.evicted += len(stale)
+        logger.info(f"[LLMCache] Evicted {len(stale)} least recently used responses.")
+
+    def stats(self) -> dict:
+        try:
+            conn = self._connection()
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"[LLMCache] Could not read cache size: {e}")
+            entries, size = None, None
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedChain:
+    '''
+    `prompt | llm`, built once, with response caching and per-call logging.
+    ainvoke/invoke return an AIMessage and astream yields AIMessageChunks, like the chain they wrap;
+    a cached response has no usage_metadata and is streamed back as a single chunk.
+    The cache is best-effort: if it fails, the error is logged and the call goes to (or returns from) the model.
+    '''
+    def __init__(self, name: str, prompt, llm, cache=None):
+        self.name = name
+        self.prompt = prompt
+        self.llm = llm
+        self.chain = prompt | llm
+        self.model = getattr(llm, "model_name", None) or name
+        self.temperature = getattr(llm, "temperature", None)
+        self.cache = cache if cache is not None else LLMCache.shared()
+
+    def _key(self, inputs: dict):
+        if self.cache is None:
+            return None
+        try:
+            return LLMCache.make_key(self.model, self.prompt.format_messages(**inputs), self.temperature)
+        except Exception as e:
+            logger.warning(f"[LLM] {self.name}: could not build cache key, calling uncached: {e}")
+            return None
+
+    def _lookup(self, key):
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"[LLM] {self.name}: cache lookup failed: {e}")
+            return None
+
+    def _store(self, key, message):
+        if key is None:
+            return
+        try:
+            self.cache.put(key, self.model, self._payload(message))
+        except Exception as e:
+            logger.warning(f"[LLM] {self.name}: could not cache response: {e}")
+
+    def _log(self, started: float, usage, cached: bool = False):
+        elapsed = time.perf_counter() - started
+        if cached:
+            logger.info(f"[LLM] {self.name}: cache hit in {elapsed:.3f}s")
+        elif usage:
+            logger.info(
+                f"[LLM] {self.name}: {elapsed:.2f}s, {usage.get('total_tokens')} tokens "
+                f"(input {usage.get('input_tokens')}, output {usage.get('output_tokens')})"
+            )
+        else:
+            logger.info(f"[LLM] {self.name}: {elapsed:.2f}s, token usage not reported")
+
+    @staticmethod
+    def _payload(message) -> dict:
+        return {"content": message.content, "usage_metadata": dict(getattr(message, "usage_metadata", None) or {})}
+
+    async def ainvoke(self, inputs: dict, runner=None):
+        '''
+        `runner`, if given, receives the zero-argument model call and awaits it (e.g. RateLimiter.run),
+        so cache hits skip it entirely.
+        '''
+        started = time.perf_counter()
+        key = self._key(inputs)
+        cached = await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            self._log(started, None, cached=True)
+            return AIMessage(content=cached["content"], response_metadata={"cache_hit": True})
+
+        call = lambda: self.chain.ainvoke(inputs)
+        message = await (runner(call) if runner else call())
+        self._log(started, getattr(message, "usage_metadata", None))
+        await asyncio.to_thread(self._store, key, message)
+        return message
+
+    def invoke(self, inputs: dict):
+        started = time.perf_counter()
+        key = self._key(inputs)
+        cached = self._lookup(key)
+        if cached is not None:
+            self._log(started, None, cached=True)
+            return AIMessage(content=cached["content"], response_metadata={"cache_hit": True})
+
+        message = self.chain.invoke(inputs)
+        self._log(started, getattr(message, "usage_metadata", None))
+        self._store(key, message)
+        return message
+
+    async def astream(self, inputs: dict):
+        '''
+        Only a stream that runs to completion is cached; one that fails or is abandoned is not.
+        '''
+        started = time.perf_counter()
+        key = self._key(inputs)
+        cached = await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            self._log(started, None, cached=True)
+            yield AIMessageChunk(content=cached["content"], response_metadata={"cache_hit": True})
+            return
+
+        message = None
+        async for chunk in self.chain.astream(inputs):
+            message = chunk if message is None else message + chunk
+            yield chunk
+        if message is None:
+            return
+        self._log(started, getattr(message, "usage_metadata", None))
+        await asyncio.to_thread(self._store, key, message)
+
+    async def discard(self, inputs: dict):
+        '''
+        Drops the cached response for these inputs, e.g. when the caller could not use it.
+        '''
+        key = self._key(inputs)
+        if key is not None:
+            try:
+                await asyncio.to_thread(self.cache.discard, key)
+            except Exception as e:
+                logger.warning(f"[LLM] {self.name}: could not discard cached response: {e}")
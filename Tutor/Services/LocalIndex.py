@@ -0,0 +1,333 @@
+'''
+This file provides an in-process vector index used as an offline alternative to AstraDB.
+Embeddings are kept L2-normalised in a float32 matrix that is memory-mapped from disk, so a search is a single
+matrix-vector product. An optional IVF layer (k-means coarse quantiser) restricts the search to the closest clusters.
+Several processes can share one index directory: saves write temp files and swap them in under a file lock, then
+bump the generation in meta.json, and a process without unsaved changes reloads when it sees a newer generation.
+'''
+import os
+import sys
+import json
+import threading
+import numpy as np
+from filelock import FileLock
+from langchain_core.documents import Document
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+class LocalVectorIndex:
+    def __init__(self, index_dir: str, embedding, nlist: int = 0, nprobe: int = 8):
+        try:
+            self.index_dir = index_dir
+            self.embedding = embedding
+            self.nlist = nlist
+            self.nprobe = nprobe
+            self._lock = threading.RLock()
+            os.makedirs(index_dir, exist_ok=True)
+
+            self._vectors_path = os.path.join(index_dir, "vectors.npy")
+            self._docs_path = os.path.join(index_dir, "docs.jsonl")
+            self._ivf_path = os.path.join(index_dir, "ivf.npz")
+            self._meta_path = os.path.join(index_dir, "meta.json")
+            self._file_lock = FileLock(os.path.join(index_dir, ".lock"))
+
+            with self._file_lock:
+                self._load()
+            logger.info(f"[LocalVectorIndex] Loaded {len(self.ids)} vectors from {index_dir} (nlist={nlist}).")
+        except Exception as e:
+            logger.error("[LocalVectorIndex] Error initializing local index.")
+            raise TutorException(e, sys)
+
+    # ——— Persistence ———
+    def _reset(self):
+        self.ids = []
+        self.docs = []
+        self._position = {}
+        self.vectors = None
+        self._pending = []
+        self.centroids = None
+        self._assignments = None
+        self._lists = None
+        self._built_size = 0
+        self._stale = False
+        self._postings = {}
+        self._dirty = False
+        self.generation = 0
+
+    def _disk_generation(self) -> int:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)["generation"]
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _load(self):
+        # Callers hold the file lock, so the files read here all belong to one save.
+        self._reset()
+        self.generation = self._disk_generation()
+        if not (os.path.exists(self._vectors_path) and os.path.exists(self._docs_path)):
+            return
+        self.vectors = np.load(self._vectors_path, mmap_mode="r")
+        with open(self._docs_path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self._position[record["id"]] = len(self.ids)
+                self.ids.append(record["id"])
+                self.docs.append(Document(page_content=record["page_content"], metadata=record["metadata"]))
+
+        if self.nlist > 0 and os.path.exists(self._ivf_path):
+            ivf = np.load(self._ivf_path)
+            if len(ivf["centroids"]) == self.nlist and len(ivf["assignments"]) == len(self.ids):
+                self._set_ivf(ivf["centroids"], ivf["assignments"])
+                self._built_size = len(self.ids)
+                return
+        self._stale = self.nlist > 0
+
+    def reload_if_changed(self):
+        '''
+        Reloads the index when another process has saved a newer generation. Unsaved local changes win:
+        they are kept and written over the newer files by the next save.
+        '''
+        with self._lock:
+            if self._dirty or self._disk_generation() == self.generation:
+                return False
+            with self._file_lock:
+                self._load()
+            logger.info(f"[LocalVectorIndex] Reloaded generation {self.generation} ({len(self.ids)} vectors).")
+            return True
+
+    def save(self):
+        with self._lock:
+            self._consolidate()
+            if self.vectors is None:
+                return
+            # Temp files are written outside the file lock; only the swap into place is serialised.
+            tmp_vectors = self._vectors_path + ".tmp.npy"
+            np.save(tmp_vectors, np.ascontiguousarray(self.vectors, dtype=np.float32))
+            tmp_docs = self._docs_path + ".tmp"
+            with open(tmp_docs, "w", encoding="utf-8") as f:
+                for doc_id, doc in zip(self.ids, self.docs):
+                    f.write(json.dumps({"id": doc_id, "page_content": doc.page_content, "metadata": doc.metadata}) + "\n")
+            tmp_ivf = None
+            if self.centroids is not None:
+                tmp_ivf = self._ivf_path + ".tmp.npz"
+                np.savez(tmp_ivf, centroids=self.centroids, assignments=self._assignments)
+
+            with self._file_lock:
+                generation = self._disk_generation()
+                if generation != self.generation:
+                    logger.warning(
+                        f"[LocalVectorIndex] Generation {generation} was saved by another process; overwriting it."
+                    )
+                os.replace(tmp_vectors, self._vectors_path)
+                os.replace(tmp_docs, self._docs_path)
+                if tmp_ivf:
+                    os.replace(tmp_ivf, self._ivf_path)
+                elif os.path.exists(self._ivf_path):
+                    os.remove(self._ivf_path)
+                # meta.json goes last, so readers never see the new generation before its files are in place.
+                tmp_meta = self._meta_path + ".tmp"
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump({"generation": generation + 1, "count": len(self.ids)}, f)
+                os.replace(tmp_meta, self._meta_path)
+                self.generation = generation + 1
+                self._dirty = False
+                # Re-open read-only so the matrix is served from the page cache rather than private memory.
+                self.vectors = np.load(self._vectors_path, mmap_mode="r")
+            logger.info(f"[LocalVectorIndex] Saved generation {self.generation} ({len(self.ids)} vectors) to {self.index_dir}.")
+
+    def _writable(self):
+        if self.vectors is not None and not self.vectors.flags.writeable:
+            self.vectors = np.array(self.vectors)
+        return self.vectors
+
+    def _flush_pending(self):
+        if self._pending:
+            rows = np.vstack(self._pending)
+            self.vectors = rows if self.vectors is None else np.vstack([np.asarray(self.vectors), rows])
+            self._pending = []
+
+    def _consolidate(self):
+        self._flush_pending()
+        if self._stale:
+            self._refresh_ivf()
+            self._stale = False
+
+    # ——— IVF ———
+    def _set_ivf(self, centroids, assignments):
+        self.centroids = centroids
+        self._assignments = assignments
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(centroids))]
+
+    def _refresh_ivf(self, iterations: int = 10):
+        n = len(self.ids)
+        if self.nlist <= 0 or n < self.nlist * 4:
+            self.centroids, self._assignments, self._lists = None, None, None
+            return
+        vectors = np.asarray(self.vectors)
+        if self.centroids is not None and n <= 2 * self._built_size:
+            # Small changes: keep the clustering and only re-assign rows.
+            self._set_ivf(self.centroids, np.argmax(vectors @ self.centroids.T, axis=1))
+            return
+
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(n, self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(self.nlist):
+                members = vectors[assignments == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+        self._set_ivf(centroids.astype(np.float32), np.argmax(vectors @ centroids.T, axis=1))
+        self._built_size = n
+        logger.info(f"[LocalVectorIndex] Built IVF with {self.nlist} lists over {n} vectors.")
+
+    def _candidates(self, query):
+        if self.centroids is None:
+            return None
+        probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        return np.concatenate([self._lists[c] for c in probes])
+
+    # ——— Metadata filtering ———
+    def _rows_for(self, key, value):
+        postings = self._postings.get(key)
+        if postings is None:
+            grouped = {}
+            for row, doc in enumerate(self.docs):
+                if key in doc.metadata:
+                    grouped.setdefault(doc.metadata[key], []).append(row)
+            postings = {k: np.asarray(rows, dtype=np.int64) for k, rows in grouped.items()}
+            self._postings[key] = postings
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        arrays = [postings[v] for v in values if v in postings]
+        return np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+
+    def _filter_rows(self, filter):
+        rows = None
+        for key, value in filter.items():
+            matching = self._rows_for(key, value)
+            rows = matching if rows is None else np.intersect1d(rows, matching, assume_unique=True)
+        return rows
+
+    # ——— Public API (mirrors the AstraDBVectorStore methods VectorStore uses) ———
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add_documents(self, documents, ids):
+        return self.add_embeddings(documents, ids, self.embedding.embed_documents([doc.page_content for doc in documents]))
+
+    def add_embeddings(self, documents, ids, vectors):
+        '''
+        Upserts documents with vectors the caller has already computed.
+        '''
+        vectors = self._normalize(vectors)
+        with self._lock:
+            new_rows = []
+            for doc, doc_id, vector in zip(documents, ids, vectors):
+                position = self._position.get(doc_id)
+                if position is None:
+                    self._position[doc_id] = len(self.ids)
+                    self.ids.append(doc_id)
+                    self.docs.append(doc)
+                    new_rows.append(vector)
+                    continue
+                self.docs[position] = doc
+                if new_rows:
+                    self._pending.append(np.stack(new_rows))
+                    new_rows = []
+                self._flush_pending()
+                self._writable()[position] = vector
+            if new_rows:
+                self._pending.append(np.stack(new_rows))
+            self._stale = True
+            self._postings = {}
+            self._dirty = True
+        return list(ids)
+
+    def delete(self, ids):
+        with self._lock:
+            self._consolidate()
+            remove = set(ids)
+            keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in remove]
+            if len(keep) == len(self.ids):
+                return False
+            self.vectors = np.asarray(self.vectors)[keep]
+            self.ids = [self.ids[i] for i in keep]
+            self.docs = [self.docs[i] for i in keep]
+            self._position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+            self._stale = True
+            self._postings = {}
+            self._dirty = True
+            return True
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, filter: dict = None):
+        '''
+        Returns up to k (Document, score) pairs. Scores are (1 + cosine) / 2, the same scale AstraDB reports.
+        A metadata `filter` narrows the candidate rows before any similarity is computed.
+        '''
+        self.reload_if_changed()
+        with self._lock:
+            self._consolidate()
+            if self.vectors is None or not self.ids:
+                return []
+            vectors, docs = self.vectors, self.docs
+            query = self._normalize(embedding)
+            candidates = self._candidates(query)
+            if filter:
+                rows = self._filter_rows(filter)
+                candidates = rows if candidates is None else np.intersect1d(candidates, rows)
+
+        if candidates is None:
+            scores = vectors @ query
+            candidates = np.arange(len(scores))
+        else:
+            scores = vectors[candidates] @ query
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(docs[candidates[i]], float((1 + scores[i]) / 2)) for i in top]
+
+    def similarity_search_batch(self, embeddings, k: int = 4, filter: dict = None, chunk_size: int = 256):
+        '''
+        Vectorised search for many queries at once; returns one list of (Document, score) pairs per query.
+        '''
+        self.reload_if_changed()
+        with self._lock:
+            self._consolidate()
+            if self.vectors is None or not self.ids:
+                return [[] for _ in embeddings]
+            if self.centroids is not None:
+                # IVF candidate sets differ per query, so fall back to per-query probing.
+                return [self.similarity_search_with_score_by_vector(e, k=k, filter=filter) for e in embeddings]
+            vectors, docs = self.vectors, self.docs
+            rows = self._filter_rows(filter) if filter else None
+
+        subset = vectors if rows is None else vectors[rows]
+        k = min(k, len(subset))
+        if k <= 0:
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(embeddings)
+        results = []
+        for start in range(0, len(queries), chunk_size):
+            scores = queries[start:start + chunk_size] @ subset.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row_ids, row_scores in zip(top, top_scores):
+                results.append([
+                    (docs[i if rows is None else rows[i]], float((1 + score) / 2))
+                    for i, score in zip(row_ids, row_scores)
+                ])
+        return results
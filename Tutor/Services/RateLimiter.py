@@ -0,0 +1,141 @@
+'''
+This file provides a token-bucket scheduler for LLM calls.
+Each model gets one limiter per process that enforces its requests-per-minute and tokens-per-minute budgets,
+and handles 429 responses centrally: a rate-limited call pauses every caller of that model, not just itself.
+Transient failures (5xx, timeouts, dropped connections) are retried with a backoff that only delays the failed call.
+'''
+import time
+import asyncio
+import httpx
+import groq
+from Tutor.Logging.Logger import logger
+from Tutor.Config.Params import get_param
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic (~4 characters per token); good enough for budgeting.
+    return max(1, len(text) // 4)
+
+
+class _Bucket:
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    _limiters = {}
+
+    def __init__(self, name: str, requests_per_minute: int = 30, tokens_per_minute: int = 6000,
+                 max_concurrency: int = 8, max_retries: int = 5, base_backoff: float = 2.0, max_backoff: float = 60.0):
+        self.name = name
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._cooldown_until = 0.0
+        self._lock = None
+        self._slots = None
+
+    @classmethod
+    def for_model(cls, model_name: str):
+        '''
+        Returns the process-wide limiter for a model, configured from `rate_limits` in params.yaml
+        (a per-model entry overrides `rate_limits.default`).
+        '''
+        limiter = cls._limiters.get(model_name)
+        if limiter is None:
+            limits = get_param("rate_limits", {}) or {}
+            config = {**(limits.get("default") or {}), **(limits.get(model_name) or {})}
+            limiter = cls(model_name, **config)
+            cls._limiters[model_name] = limiter
+        return limiter
+
+    def _primitives(self):
+        # Created lazily so the limiter can be built before the event loop starts.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._lock, self._slots
+
+    async def acquire(self, tokens: int):
+        lock, _ = self._primitives()
+        # One waiter at a time keeps callers served in arrival order.
+        async with lock:
+            while True:
+                now = time.monotonic()
+                wait = max(
+                    self._cooldown_until - now,
+                    self.requests.wait_time(1, now),
+                    self.tokens.wait_time(tokens, now),
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                await asyncio.sleep(wait)
+
+    def reconcile(self, estimated: int, actual: int):
+        '''
+        Corrects the token bucket once the provider reports how many tokens a call really used.
+        '''
+        self.tokens.level = min(self.tokens.capacity, self.tokens.level + estimated - actual)
+
+    @staticmethod
+    def _retry_after(error):
+        if getattr(error, "status_code", None) != 429 and "rate limit" not in str(error).lower():
+            return None
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def _is_transient(error) -> bool:
+        status = getattr(error, "status_code", None)
+        if isinstance(status, int) and status >= 500:
+            return True
+        return isinstance(error, (groq.APIConnectionError, httpx.TransportError, asyncio.TimeoutError, ConnectionError))
+
+    async def run(self, call, estimated_tokens: int):
+        '''
+        Awaits `call()` once budget is available, retrying rate-limited calls with a shared cooldown.
+        Transient errors are retried too, but their backoff only delays this call.
+        `call` is a zero-argument callable returning a fresh awaitable per attempt.
+        '''
+        _, slots = self._primitives()
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(estimated_tokens)
+            try:
+                async with slots:
+                    return await call()
+            except Exception as e:
+                retry_after = self._retry_after(e)
+                if attempt == self.max_retries or (retry_after is None and not self._is_transient(e)):
+                    raise
+                if retry_after is None:
+                    delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+                    logger.warning(f"[RateLimiter] {self.name} call failed ({type(e).__name__}: {e}); retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}).")
+                    await asyncio.sleep(delay)
+                    continue
+                delay = min(self.max_backoff, max(retry_after, self.base_backoff * 2 ** attempt))
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                logger.warning(f"[RateLimiter] {self.name} rate limited; pausing all calls for {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}).")
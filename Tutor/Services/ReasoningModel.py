@@ -1,6 +1,7 @@
 import sys
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Services.LLMCache import CachedChain
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
@@ -38,6 +39,7 @@ class ReasoningModel:
                 ("system", system_message),
                 ("human", human_message)
             ])
+            self.chain = CachedChain("ReasoningModel", self.prompt, self.llm)
 
             logger.info(f"Reasoning model {model_name} initialized successfully with Groq.")
 
@@ -47,12 +49,25 @@ class ReasoningModel:
 
     async def reason(self, question: str, documents: list):
         try:
-            chain = self.prompt | self.llm
-            response = await chain.ainvoke({
+            response = await self.chain.ainvoke({
                 "question": question,
                 "documents": documents
             })
             return response
         except Exception as e:
             logger.error("Error reasoning with Groq.")
-            raise TutorException(e, sys)
\ No newline at end of file
+            raise TutorException(e, sys)
+
+    async def astream(self, question: str, documents: list):
+        '''
+        Streams the response as message chunks; adding the chunks together gives the same message reason() returns.
+        '''
+        try:
+            async for chunk in self.chain.astream({
+                "question": question,
+                "documents": documents
+            }):
+                yield chunk
+        except Exception as e:
+            logger.error("Error streaming reasoning from Groq.")
+            raise TutorException(e, sys)
@@ -2,6 +2,8 @@ import sys
 import json
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Services.RateLimiter import RateLimiter, estimate_tokens
+from Tutor.Services.LLMCache import CachedChain
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.prompts import ChatPromptTemplate
@@ -23,8 +25,10 @@ class ScrapeLLM:
             self.llm = ChatGroq(
                 model=model_name,           
                 temperature=0.3,
-                max_retries=2
+                max_retries=0  # 429s are retried by the shared RateLimiter instead
             )
+            self.rate_limiter = RateLimiter.for_model(model_name)
+            self.max_output_tokens = 512
 
             self.parser = JsonOutputParser(pydantic_object=ScrapedQA)
 
@@ -47,6 +51,8 @@ class ScrapeLLM:
                 ("system", system_message),
                 ("human", human_message)
             ])
+            self.chain = CachedChain("ScrapeLLM", self.prompt, self.llm)
+            self._prompt_tokens = estimate_tokens(system_message + human_message)
 
             logger.info(f"[ScrapeLLM] Model {model_name} initialized with parser.")
 
@@ -56,10 +62,18 @@ class ScrapeLLM:
 
     async def extract(self, document: str):
         try:
-            chain = self.prompt | self.llm
-            result = await chain.ainvoke({"document": document})
+            estimated = self._prompt_tokens + estimate_tokens(document) + self.max_output_tokens
+            # Cache hits return before the rate limiter, so they cost no request or token budget.
+            result = await self.chain.ainvoke({"document": document}, runner=lambda call: self.rate_limiter.run(call, estimated))
+            usage = getattr(result, "usage_metadata", None)
+            if usage and usage.get("total_tokens"):
+                self.rate_limiter.reconcile(estimated, usage["total_tokens"])
             cleaned_content = result.content.strip("`\n")
-            parsed_result = json.loads(cleaned_content)
+            try:
+                parsed_result = json.loads(cleaned_content)
+            except json.JSONDecodeError:
+                await self.chain.discard({"document": document})  # Do not keep serving an unparseable response.
+                raise
             return parsed_result
         except Exception as e:
             logger.error("[ScrapeLLM] Error extracting from document.")
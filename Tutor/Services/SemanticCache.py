@@ -0,0 +1,109 @@
+'''
+This file provides a semantic answer cache: previously solved questions are matched by embedding similarity,
+so an equivalent question can be answered without retrieval or another LLM call.
+'''
+import re
+import sys
+import time
+import threading
+import numpy as np
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+class SemanticAnswerCache:
+    def __init__(self, embedding_model, similarity_threshold: float = 0.97, ttl_seconds: float = 3600, max_size: int = 1024):
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._entries = []  # dicts with question, numbers, value, created_at, last_used, latency
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    @staticmethod
+    def _numbers(question: str):
+        # Questions that differ only in their numbers embed almost identically but have different answers.
+        return tuple(NUMBER_PATTERN.findall(question))
+
+    def _embed(self, question: str):
+        vector = np.asarray(self.embedding_model.embed_query(question), dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def _evict_expired(self, now):
+        keep = [i for i, entry in enumerate(self._entries) if now - entry["created_at"] < self.ttl_seconds]
+        if len(keep) != len(self._entries):
+            self._entries = [self._entries[i] for i in keep]
+            self._vectors = self._vectors[keep]
+
+    def lookup(self, question: str):
+        '''
+        Returns the cached value for the most similar live question above the threshold, or None.
+        '''
+        try:
+            vector = self._embed(question)
+            numbers = self._numbers(question)
+            now = time.monotonic()
+            with self._lock:
+                self._evict_expired(now)
+                if self._entries:
+                    similarities = self._vectors @ vector
+                    for i in np.argsort(-similarities):
+                        if similarities[i] < self.similarity_threshold:
+                            break
+                        entry = self._entries[i]
+                        if entry["numbers"] != numbers:
+                            continue
+                        entry["last_used"] = now
+                        self.hits += 1
+                        self.latency_saved += entry["latency"]
+                        logger.info(f"[SemanticAnswerCache] Hit (similarity {similarities[i]:.3f}) for: {question[:60]}...")
+                        return entry["value"]
+                self.misses += 1
+                return None
+        except Exception as e:
+            logger.error("[SemanticAnswerCache] Error looking up cached answer.")
+            raise TutorException(e, sys)
+
+    def store(self, question: str, value, latency: float):
+        try:
+            vector = self._embed(question)
+            now = time.monotonic()
+            with self._lock:
+                entry = {
+                    "question": question,
+                    "numbers": self._numbers(question),
+                    "value": value,
+                    "created_at": now,
+                    "last_used": now,
+                    "latency": latency,
+                }
+                if not self._entries:
+                    self._vectors = vector[None, :]
+                else:
+                    self._vectors = np.vstack([self._vectors, vector])
+                self._entries.append(entry)
+
+                if len(self._entries) > self.max_size:
+                    # Drop the least recently used entry.
+                    oldest = min(range(len(self._entries)), key=lambda i: self._entries[i]["last_used"])
+                    del self._entries[oldest]
+                    self._vectors = np.delete(self._vectors, oldest, axis=0)
+        except Exception as e:
+            logger.error("[SemanticAnswerCache] Error storing answer.")
+            raise TutorException(e, sys)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "latency_saved_seconds": round(self.latency_saved, 3),
+            }
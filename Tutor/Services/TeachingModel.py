@@ -1,14 +1,19 @@
 import sys
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
+from Tutor.Config.Params import get_param
+from Tutor.Services.LLMCache import CachedChain
 
 from langchain_groq import ChatGroq
 from langchain.prompts.chat import ChatPromptTemplate
 import asyncio
 
 class TeachingModel:
-    def __init__(self, model_name):
+    def __init__(self, model_name, max_concurrency=None, timeout_seconds=None):
         try:
+            self.max_concurrency = max_concurrency or get_param("teaching_model.max_concurrency", 8)
+            self.timeout_seconds = timeout_seconds or get_param("teaching_model.timeout_seconds", 60)
+            self._slots = None
             self.llm = ChatGroq(
                 model=model_name,
                 temperature=0.7,
@@ -35,30 +40,99 @@ Feedback History:
                 ("system", system_message),
                 ("human", human_message)
             ])
+            self.chain = CachedChain("TeachingModel", self.prompt, self.llm)
+
+            self.summary_chain = CachedChain("TeachingModel.summary", ChatPromptTemplate.from_messages([
+                ("system", "Condense a student's feedback on a math explanation into a few short sentences. "
+                           "Keep what confused them and what they asked for; drop pleasantries."),
+                ("human", "Summary so far:\n{summary}\n\nNew feedback:\n{turns}")
+            ]), self.llm)
 
             logger.info(f"Teaching model {model_name} initialized successfully with Groq.")
         except Exception as e:
             logger.error("Error initializing teaching model.")
             raise TutorException(e, sys)
 
+    @staticmethod
+    def _inputs(question, answer, explanation, feedback_history):
+        return {
+            "question": question,
+            "answer": answer,
+            "explanation": explanation or "",
+            "feedback_history": "\n".join(feedback_history or [])
+        }
+
     def teach(self, question, answer, explanation=None, feedback_history=None, thread_id=None):
         try:
             logger.info(f"Teaching session started for thread: {thread_id}")
-            feedback_text = "\n".join(feedback_history or [])
-            chain = self.prompt | self.llm
-            model_response = chain.invoke({
-                "question": question,
-                "answer": answer,
-                "explanation": explanation or "",
-                "feedback_history": feedback_text
-            })
+            model_response = self.chain.invoke(self._inputs(question, answer, explanation, feedback_history))
+            return model_response.content.strip()
+        except Exception as e:
+            logger.error("Error teaching student.")
+            raise TutorException(e, sys)
+
+    async def ateach(self, question, answer, explanation=None, feedback_history=None, thread_id=None):
+        '''
+        Non-blocking teach(): awaits the Groq call, with at most `max_concurrency` calls in flight
+        and each one bounded by `timeout_seconds`.
+        '''
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            logger.info(f"Teaching session started for thread: {thread_id}")
+            async with self._slots:
+                model_response = await asyncio.wait_for(
+                    self.chain.ainvoke(self._inputs(question, answer, explanation, feedback_history)),
+                    timeout=self.timeout_seconds,
+                )
             return model_response.content.strip()
+        except asyncio.TimeoutError as te:
+            logger.error(f"Teaching call timed out after {self.timeout_seconds}s for thread: {thread_id}")
+            raise TutorException(te, sys)
         except Exception as e:
             logger.error("Error teaching student.")
             raise TutorException(e, sys)
-        
+
+    async def astream(self, question, answer, explanation=None, feedback_history=None, thread_id=None):
+        '''
+        Streams the explanation as it is generated. Shares ateach()'s concurrency limit, and `timeout_seconds`
+        bounds the whole stream.
+        '''
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            logger.info(f"Streaming teaching session started for thread: {thread_id}")
+            async with self._slots:
+                async with asyncio.timeout(self.timeout_seconds):
+                    async for chunk in self.chain.astream(self._inputs(question, answer, explanation, feedback_history)):
+                        if chunk.content:
+                            yield chunk.content
+        except TimeoutError as te:
+            logger.error(f"Teaching stream timed out after {self.timeout_seconds}s for thread: {thread_id}")
+            raise TutorException(te, sys)
+        except Exception as e:
+            logger.error("Error streaming explanation.")
+            raise TutorException(e, sys)
+
+    async def asummarize(self, summary, turns):
+        '''
+        Folds older feedback turns into a running summary, so long threads keep a bounded prompt.
+        '''
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._slots:
+                response = await asyncio.wait_for(
+                    self.summary_chain.ainvoke({"summary": summary or "(none)", "turns": "\n".join(turns)}),
+                    timeout=self.timeout_seconds,
+                )
+            return response.content.strip()
+        except Exception as e:
+            logger.error("Error summarizing feedback history.")
+            raise TutorException(e, sys)
+
     async def explain(self, question, answer, explanation=None, feedback_history=None, thread_id=None):
-        return self.teach(
+        return await self.ateach(
             question=question,
             answer=answer,
             explanation=explanation,
@@ -1,33 +1,52 @@
 import os
 import sys
+import time
 from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from langchain_astradb import AstraDBVectorStore
+from astrapy.exceptions import CollectionInsertManyException
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 from Tutor.Services.EmbeddingModel import EmbeddingModel
+from Tutor.Services.LocalIndex import LocalVectorIndex
+from Tutor.Config.Params import get_param
 
 class VectorStore:
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, backend: str = None):
         try:
             self.embedding_model = EmbeddingModel(model_name=model_name)
-            self.vector_store = AstraDBVectorStore(
-                collection_name = "TutorDB",
-                embedding = self.embedding_model,
-                api_endpoint=os.getenv("ASTRA_DB_API_ENDPOINT"),
-                token=os.getenv("ASTRA_DB_TOKEN"),
-                autodetect_collection=True,
-            )
-            logger.info("Vector store initialized successfully.")
+            self.backend = backend or get_param("vectorstore.backend", "astradb")
+            if self.backend == "astradb":
+                self.vector_store = AstraDBVectorStore(
+                    collection_name = "TutorDB",
+                    embedding = self.embedding_model,
+                    api_endpoint=os.getenv("ASTRA_DB_API_ENDPOINT"),
+                    token=os.getenv("ASTRA_DB_TOKEN"),
+                    autodetect_collection=True,
+                )
+            elif self.backend == "local":
+                self.vector_store = LocalVectorIndex(
+                    index_dir=get_param("vectorstore.local.index_dir", "Tutor/Artifacts/LocalIndex"),
+                    embedding=self.embedding_model,
+                    nlist=get_param("vectorstore.local.nlist", 0),
+                    nprobe=get_param("vectorstore.local.nprobe", 8),
+                )
+            else:
+                raise ValueError(f"Unknown vector store backend: {self.backend}")
+            logger.info(f"Vector store initialized successfully with backend '{self.backend}'.")
         except Exception as e:
             logger.error("Error initializing vector store.")
             raise TutorException(e, sys)
 
-    def add_documents(self, documents):
+    def add_documents(self, documents, ids=None):
         try:
             if not documents:
                 raise ValueError("No documents to add.")
-            uuids = [str(uuid4()) for _ in range(len(documents))]
-            self.vector_store.add_documents(documents=documents, ids=uuids)
+            if ids is None:
+                ids = [str(uuid4()) for _ in range(len(documents))]
+            elif len(ids) != len(documents):
+                raise ValueError("Number of ids must match number of documents.")
+            self.vector_store.add_documents(documents=documents, ids=ids)
             logger.info(f"Added {len(documents)} documents to the vector store.")
         except ValueError as ve:
             logger.error(f"Adding documents error: {ve}")
@@ -36,15 +55,181 @@ class VectorStore:
             logger.error("Error adding documents to vector store.")
             raise TutorException(e, sys)
 
-    def retrieve(self, query, threshold, num_results):
+    def _add_embeddings(self, documents, ids, vectors):
+        '''
+        Upserts documents with precomputed vectors, so the store does not embed them again.
+        '''
+        if hasattr(self.vector_store, "add_embeddings"):
+            self.vector_store.add_embeddings(documents, ids, vectors)
+            return
+        # AstraDBVectorStore has no vector-taking insert, so write through its collection with the store's own codec.
+        codec = self.vector_store.document_codec
+        records = [
+            codec.encode(content=doc.page_content, document_id=doc_id, vector=list(vector), metadata=doc.metadata)
+            for doc, doc_id, vector in zip(documents, ids, vectors)
+        ]
+        self.vector_store.astra_env.ensure_db_setup()
+        collection = self.vector_store.astra_env.collection
         try:
-            retriever = self.vector_store.as_retriever(
-                search_type="similarity_score_threshold",
-                search_kwargs={"k": num_results, "score_threshold": threshold},
+            collection.insert_many(records, ordered=False)
+        except CollectionInsertManyException as e:
+            # Ids already in the store (re-pushed documents) are replaced; any other failure surfaces from replace_one.
+            inserted = set(e.inserted_ids)
+            for record in records:
+                doc_id = codec.get_id(record)
+                if doc_id not in inserted:
+                    collection.replace_one(codec.encode_query(ids=[doc_id]), record, upsert=True)
+
+    def _upload_chunk(self, documents, ids, vectors, max_retries):
+        for attempt in range(1, max_retries + 1):
+            try:
+                start = time.perf_counter()
+                self._add_embeddings(documents, ids, vectors)
+                return time.perf_counter() - start
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                backoff = 2 ** (attempt - 1)
+                logger.warning(f"Chunk upload failed (attempt {attempt}/{max_retries}): {e}. Retrying in {backoff}s.")
+                time.sleep(backoff)
+
+    def add_documents_bulk(self, documents, ids=None, chunk_size=256, max_in_flight=2, max_retries=3):
+        '''
+        Embeds and uploads documents in chunks, embedding chunk N+1 while up to `max_in_flight` chunks upload.
+        A chunk that still fails after `max_retries` attempts is skipped without affecting the others.
+        Returns the ids that were uploaded successfully.
+        '''
+        try:
+            if not documents:
+                raise ValueError("No documents to add.")
+            if ids is None:
+                ids = [str(uuid4()) for _ in range(len(documents))]
+            elif len(ids) != len(documents):
+                raise ValueError("Number of ids must match number of documents.")
+            if chunk_size <= 0 or max_in_flight <= 0 or max_retries <= 0:
+                raise ValueError("chunk_size, max_in_flight and max_retries must be positive.")
+
+            start = time.perf_counter()
+            embed_time, upload_time = 0.0, 0.0
+            uploaded, failed = [], 0
+            in_flight = {}
+
+            def collect(futures):
+                nonlocal upload_time, failed
+                for future in futures:
+                    chunk_ids = in_flight.pop(future)
+                    try:
+                        upload_time += future.result()
+                        uploaded.extend(chunk_ids)
+                    except Exception as e:
+                        failed += len(chunk_ids)
+                        logger.error(f"Dropping chunk of {len(chunk_ids)} documents after {max_retries} attempts: {e}")
+
+            with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+                for i in range(0, len(documents), chunk_size):
+                    chunk_docs = documents[i:i + chunk_size]
+                    chunk_ids = ids[i:i + chunk_size]
+
+                    embed_start = time.perf_counter()
+                    vectors = self.embedding_model.embed_documents([doc.page_content for doc in chunk_docs])
+                    embed_time += time.perf_counter() - embed_start
+
+                    if len(in_flight) >= max_in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    future = executor.submit(self._upload_chunk, chunk_docs, chunk_ids, vectors, max_retries)
+                    in_flight[future] = chunk_ids
+
+                collect(list(in_flight))
+
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            logger.info(
+                f"Bulk ingest: {len(uploaded)} uploaded, {failed} failed in {elapsed:.2f}s "
+                f"({len(uploaded) / elapsed:.1f} docs/sec; embedding {embed_time:.2f}s, upload {upload_time:.2f}s)."
             )
-            results = retriever.invoke(query)
-            logger.info(f"Performed retrieval for query with score threshold {threshold}")
-            return results
+            return uploaded
+        except ValueError as ve:
+            logger.error(f"Bulk ingest error: {ve}")
+            raise TutorException(ve, sys)
+        except Exception as e:
+            logger.error("Error bulk-adding documents to vector store.")
+            raise TutorException(e, sys)
+
+    def flush(self):
+        '''
+        Persists pending writes for backends that buffer them (the local index); a no-op for AstraDB.
+        '''
+        try:
+            save = getattr(self.vector_store, "save", None)
+            if save:
+                save()
+        except Exception as e:
+            logger.error("Error flushing vector store.")
+            raise TutorException(e, sys)
+
+    def delete_documents(self, ids):
+        try:
+            if not ids:
+                return
+            self.vector_store.delete(ids=list(ids))
+            logger.info(f"Deleted {len(ids)} documents from the vector store.")
+        except Exception as e:
+            logger.error("Error deleting documents from vector store.")
+            raise TutorException(e, sys)
+
+    def _backend_filter(self, filters):
+        if not filters:
+            return None
+        if self.backend == "local":
+            return filters
+        # AstraDB takes a Data API filter on metadata fields; lists become $in clauses.
+        return {key: {"$in": list(value)} if isinstance(value, (list, tuple, set)) else value for key, value in filters.items()}
+
+    def retrieve(self, query, threshold, num_results, filters=None):
+        try:
+            embedding = self.embedding_model.embed_query(query)
+            return self.retrieve_by_vector(embedding, threshold, num_results, filters=filters)
         except Exception as e:
             logger.error(f"Error retrieving documents for query: {query}")
-            raise TutorException(e, sys)
\ No newline at end of file
+            raise TutorException(e, sys)
+
+    def retrieve_by_vector(self, embedding, threshold, num_results, filters=None):
+        try:
+            results = self.vector_store.similarity_search_with_score_by_vector(
+                embedding=embedding,
+                k=num_results,
+                filter=self._backend_filter(filters),
+            )
+            docs = [doc for doc, score in results if score >= threshold]
+            logger.info(
+                f"Performed retrieval with score threshold {threshold} and filters {filters or {}}: "
+                f"{len(docs)} of {len(results)} kept"
+            )
+            return docs
+        except Exception as e:
+            logger.error("Error retrieving documents for embedding.")
+            raise TutorException(e, sys)
+
+    def retrieve_batch_by_vectors(self, embeddings, threshold, num_results, filters=None, max_workers=8):
+        '''
+        Runs one search per embedding and returns a list of document lists in the same order.
+        The local backend scores all queries with a single matrix product; AstraDB searches run concurrently.
+        '''
+        try:
+            backend_filter = self._backend_filter(filters)
+            if hasattr(self.vector_store, "similarity_search_batch"):
+                results = self.vector_store.similarity_search_batch(embeddings, k=num_results, filter=backend_filter)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(
+                        lambda embedding: self.vector_store.similarity_search_with_score_by_vector(
+                            embedding=embedding, k=num_results, filter=backend_filter
+                        ),
+                        embeddings,
+                    ))
+            docs = [[doc for doc, score in result if score >= threshold] for result in results]
+            logger.info(f"Performed batch retrieval for {len(embeddings)} queries with score threshold {threshold}")
+            return docs
+        except Exception as e:
+            logger.error("Error retrieving documents for embedding batch.")
+            raise TutorException(e, sys)
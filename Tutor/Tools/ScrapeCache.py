@@ -0,0 +1,136 @@
+'''
+This file provides a disk-backed cache for scraped pages, so sites that web search keeps returning
+are not re-fetched (and re-billed) through ScrapingAnt on every request.
+Entries are keyed by normalised URL, stored zstd-compressed in SQLite, and expire after a TTL.
+The cache is best-effort: SQLite errors are logged and the page is scraped as if it were not cached.
+'''
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import zstandard
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from langchain_core.documents import Document
+from Tutor.Logging.Logger import logger
+from Tutor.Exception.Exception import TutorException
+
+TRACKING_PARAMS = {"gclid", "fbclid", "mc_cid", "mc_eid"}
+
+
+def normalize_url(url: str) -> str:
+    '''
+    Lower-cases scheme and host, drops the fragment, default ports and tracking parameters, and sorts the query.
+    '''
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (key.lower().startswith("utm_") or key.lower() in TRACKING_PARAMS)
+    )
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class ScrapeCache:
+    def __init__(self, db_path: str = "Tutor/Artifacts/ScrapeCache/scrape_cache.sqlite", ttl_seconds: float = 7 * 24 * 3600,
+                 compression_level: int = 10):
+        try:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self.db_path = db_path
+            self.ttl_seconds = ttl_seconds
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+            self._local = threading.local()
+            conn = self._connection()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url_hash TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    fetched_at REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
+        except Exception as e:
+            logger.error("[ScrapeCache] Error initializing scrape cache.")
+            raise TutorException(e, sys)
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads, so each thread opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def _decode(self, payload: bytes):
+        records = json.loads(self._decompressor.decompress(payload))
+        return [Document(page_content=r["page_content"], metadata=r["metadata"]) for r in records]
+
+    def _encode(self, documents) -> bytes:
+        records = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents]
+        return self._compressor.compress(json.dumps(records).encode("utf-8"))
+
+    def get(self, url: str):
+        '''
+        Returns the cached Documents for a URL, or None when the entry is missing or stale.
+        Cache errors are logged and treated as a miss, so a broken cache never fails a scrape.
+        '''
+        try:
+            return self._get(url)
+        except Exception as e:
+            logger.warning(f"[ScrapeCache] Lookup failed for {url}, scraping instead: {e}")
+            return None
+
+    def _get(self, url: str):
+        row = self._connection().execute(
+            "SELECT payload, fetched_at FROM pages WHERE url_hash = ?", (self._key(url),)
+        ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.info(f"[ScrapeCache] Hit for {url}")
+        return self._decode(row[0])
+
+    def put(self, url: str, documents):
+        '''
+        Stores the Documents for a URL. Errors are logged and ignored.
+        '''
+        if not documents:
+            return
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (url_hash, url, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (self._key(url), normalize_url(url), self._encode(documents), time.time()),
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"[ScrapeCache] Could not store {url}: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
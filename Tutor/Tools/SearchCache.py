@@ -0,0 +1,95 @@
+'''
+This file provides the WebSearch result cache.
+Results are kept for a TTL under the normalised query and max_results, and concurrent identical searches
+are coalesced: the first caller queries Tavily while the others await the same future.
+Only successful results are stored; TavilySearch reports failures as an {"error": ...} payload instead of raising.
+'''
+import time
+import asyncio
+from collections import OrderedDict
+from Tutor.Logging.Logger import logger
+from Tutor.Services.EmbeddingCache import normalize_text
+
+
+class SearchCache:
+    def __init__(self, ttl_seconds: float = 3600, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(query: str, max_results: int):
+        return normalize_text(query).lower(), max_results
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    @staticmethod
+    def _is_error(result) -> bool:
+        return result is None or (isinstance(result, dict) and "error" in result)
+
+    def _put(self, key, result):
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, query: str, max_results: int, fetch):
+        '''
+        Returns the cached result for the query, or awaits `fetch()` once for all concurrent callers.
+        Failures are not cached: every caller waiting on a failed fetch sees the same exception, or the same
+        error payload, and the next call fetches again.
+        '''
+        key = self._key(query, max_results)
+        result = self._get(key)
+        if result is not None:
+            self.hits += 1
+            logger.info(f"[SearchCache] Hit for query: {query}")
+            return result
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            logger.info(f"[SearchCache] Joining in-flight search for query: {query}")
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+            if self._is_error(result):
+                logger.warning(f"[SearchCache] Not caching failed search for query: {query}")
+            else:
+                self._put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited failure is not logged as unhandled.
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
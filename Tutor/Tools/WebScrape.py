@@ -4,12 +4,16 @@ This file is essentially used to scrape the webpages, that were found by our Web
 
 import sys
 import os
+import httpx
 from Tutor.Logging.Logger import logger
 from Tutor.Exception.Exception import TutorException
 from langchain_community.document_loaders import ScrapingAntLoader
+from langchain_core.documents import Document
 from dotenv import load_dotenv
 load_dotenv()
 
+SCRAPINGANT_MARKDOWN_URL = "https://api.scrapingant.com/v2/markdown"
+
 class WebScrape:
     def __init__ (self):
         try:
@@ -19,6 +23,7 @@ class WebScrape:
                 "proxy_type": "datacenter",
                 "proxy_country": "us"
             }
+            self._client = None
             logger.info("WebScrape tool initialized successfully.")
         except Exception as e:
             logger.error(f"Error initializing WebScrape tool")
@@ -26,7 +31,7 @@ class WebScrape:
 
     def scrape(self, url: str):
         try:
-            print("Inside the tool")
+            logger.debug("Inside the tool")
             logger.info(f"Scraping URL: {url}")
             loader = ScrapingAntLoader(
                 [url],
@@ -39,4 +44,47 @@ class WebScrape:
             return documents
         except Exception as e:
             logger.error(f"Error scraping URL")
-            raise TutorException(e, sys)
\ No newline at end of file
+            raise TutorException(e, sys)
+
+    def _async_client(self):
+        # One pooled client per server process, so concurrent scrapes reuse keep-alive connections to ScrapingAnt.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={"x-api-key": os.getenv("SCRAPINGANT_TOKEN", "")},
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+            )
+        return self._client
+
+    async def ascrape(self, url: str):
+        '''
+        Async equivalent of scrape(): calls the ScrapingAnt markdown endpoint directly and returns the same
+        list of Documents, empty when the page could not be fetched (as with continue_on_failure).
+        '''
+        try:
+            logger.info(f"Scraping URL: {url}")
+            params = {
+                "url": url,
+                "browser": str(self.scrape_config["browser"]).lower(),
+                "proxy_type": self.scrape_config["proxy_type"],
+                "proxy_country": self.scrape_config["proxy_country"],
+            }
+            response = await self._async_client().get(SCRAPINGANT_MARKDOWN_URL, params=params)
+            if response.status_code != 200:
+                logger.error(f"Error fetching data from {url}: HTTP {response.status_code} {response.text[:200]}")
+                return []
+            data = response.json()
+            documents = [Document(page_content=data["markdown"], metadata={"url": data.get("url", url)})]
+            logger.info(f"Scraped {len(documents)} documents from {url}")
+            return documents
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching data from {url}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Error scraping URL")
+            raise TutorException(e, sys)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -22,4 +22,13 @@ class WebSearch:
             return response
         except Exception as e:
             logger.error("Error during web search.")
-            raise TutorException(e, sys)
\ No newline at end of file
+            raise TutorException(e, sys)
+
+    async def asearch(self, query: str):
+        try:
+            response = await self.searchtool.ainvoke({"query": query})
+            logger.info(f"Web search completed for query: {query}")
+            return response
+        except Exception as e:
+            logger.error("Error during web search.")
+            raise TutorException(e, sys)